@@ -8,6 +8,12 @@ hard-coding metric logic in the base Filter class.
 from openfilter.filter_runtime.filter import Filter
 from openfilter.observability import MetricSpec
 
+# Simulated detection results, built once and shared by every frame since nothing downstream mutates them
+_PLATES = (
+    {"confidence": 0.85, "text": "ABC123"},
+    {"confidence": 0.92, "text": "XYZ789"},
+)
+
 
 class LicensePlateFilter(Filter):
     """Example filter that demonstrates MetricSpec declarations.
@@ -27,24 +33,27 @@ class LicensePlateFilter(Filter):
         # Frames that contain license plates
         MetricSpec(
             name="frames_with_plate",
-            instrument="counter", 
-            value_fn=lambda d: 1 if d.get("plates") else 0
+            instrument="counter",
+            field="plates",
+            agg="bool"
         ),
         
         # Distribution of plates per frame
         MetricSpec(
             name="plates_per_frame",
             instrument="histogram",
-            value_fn=lambda d: len(d.get("plates", [])),
+            field="plates",
+            agg="len",
             boundaries=[0, 1, 2, 5, 10]
         ),
         
-        # Average confidence of detected plates
+        # Best confidence of detected plates, exponential buckets so no boundaries to tune
         MetricSpec(
             name="plate_confidence",
-            instrument="histogram",
-            value_fn=lambda d: max([p.get("confidence", 0) for p in d.get("plates", [])], default=None),
-            boundaries=[0.0, 0.5, 0.7, 0.8, 0.9, 1.0]
+            instrument="exp_histogram",
+            field="plates",
+            key="confidence",
+            agg="max"
         )
     ]
     
@@ -56,11 +65,7 @@ class LicensePlateFilter(Filter):
         """
         # Example processing - in reality this would do actual detection
         for frame in frames.values():
-            if hasattr(frame, 'data'):
-                # Simulate license plate detection results
-                frame.data["plates"] = [
-                    {"confidence": 0.85, "text": "ABC123"},
-                    {"confidence": 0.92, "text": "XYZ789"}
-                ]
+            # Simulate license plate detection results
+            frame.data["plates"] = _PLATES
         
         return frames 
\ No newline at end of file
@@ -8,6 +8,16 @@ without hard-coding metric logic in the base Filter class.
 from openfilter.filter_runtime.filter import Filter
 from openfilter.observability import MetricSpec
 
+# Simulated OCR results, built once and shared by every frame since nothing downstream mutates them. Regions are
+# stored column-wise (one sequence per field) rather than as a dict per region. "bboxes" is flat with four ints
+# (x0, y0, x1, y1) per region so a consumer can do np.asarray(bboxes, np.int16).reshape(-1, 4) in one shot.
+_TEXT = "ABC123 XYZ789"
+_TEXT_REGIONS = {
+    "texts": ("ABC123", "XYZ789"),
+    "confidences": (0.85, 0.92),
+    "bboxes": (100, 100, 200, 150, 300, 100, 400, 150),
+}
+
 
 class OCRFilter(Filter):
     """Example OCR filter that demonstrates MetricSpec declarations.
@@ -29,14 +39,16 @@ class OCRFilter(Filter):
         MetricSpec(
             name="frames_with_text",
             instrument="counter",
-            value_fn=lambda d: 1 if d.get("text") else 0
+            field="text",
+            agg="bool"
         ),
         
         # Distribution of characters per frame
         MetricSpec(
             name="chars_per_frame",
             instrument="histogram",
-            value_fn=lambda d: len(d.get("text", "")),
+            field="text",
+            agg="len",
             boundaries=[0, 10, 20, 50, 100, 200]
         ),
         
@@ -44,7 +56,9 @@ class OCRFilter(Filter):
         MetricSpec(
             name="text_regions_per_frame",
             instrument="histogram",
-            value_fn=lambda d: len(d.get("text_regions", [])),
+            field="text_regions",
+            key="confidences",
+            agg="len",
             boundaries=[0, 1, 2, 5, 10]
         ),
         
@@ -52,7 +66,9 @@ class OCRFilter(Filter):
         MetricSpec(
             name="ocr_confidence",
             instrument="histogram",
-            value_fn=lambda d: sum([r.get("confidence", 0) for r in d.get("text_regions", [])]) / max(len(d.get("text_regions", [])), 1),
+            field="text_regions",
+            key="confidences",
+            agg="mean",
             boundaries=[0.0, 0.5, 0.7, 0.8, 0.9, 1.0]
         )
     ]
@@ -65,12 +81,8 @@ class OCRFilter(Filter):
         """
         # Example processing - in reality this would do actual OCR
         for frame in frames.values():
-            if hasattr(frame, 'data'):
-                # Simulate OCR results
-                frame.data["text"] = "ABC123 XYZ789"
-                frame.data["text_regions"] = [
-                    {"text": "ABC123", "confidence": 0.85, "bbox": [100, 100, 200, 150]},
-                    {"text": "XYZ789", "confidence": 0.92, "bbox": [300, 100, 400, 150]}
-                ]
+            # Simulate OCR results
+            frame.data["text"] = _TEXT
+            frame.data["text_regions"] = _TEXT_REGIONS
         
         return frames 
\ No newline at end of file
@@ -12,22 +12,27 @@ The example reads a video file using VideoIn, visualizes it with WebVis, and sav
 frames as images using the ImageOut filter with different configurations.
 """
 
+import importlib.util
 import os
 import sys
 from pathlib import Path
 
-# Add the parent directory to the path so we can import openfilter
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+_ROOT = Path(__file__).resolve().parents[2]
 
-from openfilter.filter_runtime.filter import Filter, FilterConfig
-from openfilter.filter_runtime.filters.image_out import ImageOut
-from openfilter.filter_runtime.filters.video_in import VideoIn
-from openfilter.filter_runtime.filters.webvis import Webvis
+# OF_INPROC=1 runs every filter as a thread of this process linked over 'inproc://' instead of processes over TCP
+INPROC = os.getenv('OF_INPROC', 'false').lower() in ('1', 'true', 'yes')
+LINK = 'inproc://5550' if INPROC else 'tcp://127.0.0.1:5550'
 
 
 def main():
     """Run the ImageOut filter demo."""
-    
+
+    # Imported here so that just loading this script does not pull in cv2, numpy and opentelemetry
+    from openfilter.filter_runtime.filter import Filter, FilterConfig
+    from openfilter.filter_runtime.filters.image_out import ImageOut, ImageOutSink
+    from openfilter.filter_runtime.filters.video_in import VideoIn
+    from openfilter.filter_runtime.filters.webvis import Webvis
+
     # Get the sample video path
     sample_video_path = Path(__file__).parent.parent / 'openfilter-heroku-demo' / 'assets' / 'sample-video.mp4'
     
@@ -57,12 +62,12 @@ def main():
         print("Press Ctrl+C to stop the demo")
         print()
         
-        Filter.run_multi([
+        (Filter.run_multi_inproc if INPROC else Filter.run_multi)([
             # VideoIn: Read sample video and output to both WebVis and ImageOut
             (VideoIn, FilterConfig({
                 'id': 'video-input',
                 'sources': f'file://{sample_video_path}',
-                'outputs': 'tcp://127.0.0.1:5550',  # Split to both filters
+                'outputs': LINK,  # Split to both filters
                 'sync': False,  # Process as fast as possible
                 'loop': False   # Play once
             })),
@@ -70,31 +75,40 @@ def main():
             # ImageOut: Save frames in multiple formats
             (ImageOut, FilterConfig({
                 'id': 'image-output',
-                'sources': 'tcp://127.0.0.1:5550',
+                'sources': LINK,
+                # Structured outputs, same as e.g. 'file://.../frames_%Y%m%d_%H%M%S_%d.png!format=png!compression=0'
+                # but nothing to parse
                 'outputs': [
                     # PNG output with high quality (lossless)
-                    f'file://{output_dir}/frames_%Y%m%d_%H%M%S_%d.png!format=png!compression=0',
+                    ImageOutSink(f'{output_dir}/frames_%Y%m%d_%H%M%S_%d.png', 'png', compression=0),
                     
                     # JPG output with medium quality (smaller files)
-                    f'file://{output_dir}/frames_%Y%m%d_%H%M%S_%d.jpg!format=jpg!quality=85',
+                    ImageOutSink(f'{output_dir}/frames_%Y%m%d_%H%M%S_%d.jpg', 'jpg', quality=85),
                     
                     # WebP output (modern format)
-                    f'file://{output_dir}/frames_%Y%m%d_%H%M%S_%d.webp!format=webp!quality=90',
+                    ImageOutSink(f'{output_dir}/frames_%Y%m%d_%H%M%S_%d.webp', 'webp', quality=90),
                     
                     # BMP output (uncompressed)
-                    f'file://{output_dir}/frames_%Y%m%d_%H%M%S_%d.bmp!format=bmp'
+                    ImageOutSink(f'{output_dir}/frames_%Y%m%d_%H%M%S_%d.bmp', 'bmp'),
                 ],
                 
                 # Global settings (can be overridden per output)
                 'bgr': True,
                 'quality': 95,
-                'compression': 6
+                'compression': 6,
+
+                # Encode/write each output on its own thread with up to this many frames queued,
+                # so the four formats run in parallel instead of back to back (0 = write inline)
+                'prefetch': 4,
+
+                # Pin each of those writer threads to its own CPU so they don't migrate between cores (Linux only)
+                'pin_cpu': True,
             })),
             
             # WebVis: Visualize video stream in browser (no outputs - just serves HTTP)
             (Webvis, FilterConfig({
                 'id': 'web-visualization',
-                'sources': 'tcp://127.0.0.1:5550',
+                'sources': LINK,
                 'port': 8000
             }))
         ])
@@ -118,4 +132,8 @@ def main():
 
 
 if __name__ == '__main__':
+    # Fall back to the source tree only when openfilter is not installed
+    if importlib.util.find_spec('openfilter') is None:
+        sys.path.insert(0, str(_ROOT))
+
     main()
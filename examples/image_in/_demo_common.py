@@ -0,0 +1,184 @@
+"""
+Helpers shared by the ImageIn scenario scripts for generating their test images.
+
+Not a scenario itself, the scripts import it from this directory (run them from here as shown in README.md).
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from openfilter.filter_runtime.filter import Filter
+
+FRAME_SHAPE = (480, 640, 3)
+
+# Flat color demo frames look the same at quality 75 as at the default 95, encode a bit faster and are ~25% smaller
+JPG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 75, cv2.IMWRITE_JPEG_PROGRESSIVE, 0, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+
+# OF_IPC=1 links the filters over Unix domain sockets instead of TCP loopback, they all run on this one machine
+IPC = os.getenv('OF_IPC', 'false').lower() in ('1', 'true', 'yes')
+
+# OF_INPROC=1 runs every filter as a thread of this process linked over 'inproc://' instead of processes over TCP, for
+# the scripts which start their pipeline with run_multi() and inproc_link() from here
+INPROC = os.getenv('OF_INPROC', 'false').lower() in ('1', 'true', 'yes')
+run_multi = Filter.run_multi_inproc if INPROC else Filter.run_multi
+
+# Filters run as processes on this one machine hand images to each other through shared memory and only the frame
+# metadata goes over TCP / IPC. Set at import, before any filter process is started, so they all inherit it.
+if not INPROC:
+    os.environ.setdefault('OPENFILTER_SHM_ENABLE', '1')
+
+_SCRATCH = threading.local()
+
+def link(port):
+    """Return the (outputs, sources) address pair for the link on `port`. With OF_IPC a socket file under /tmp named
+    for this process, so the filter processes it starts all agree on it and two runs don't collide."""
+    if IPC:
+        addr = f'ipc:///tmp/openfilter-{os.getpid()}-{port}'
+        return addr, addr
+    return f'tcp://*:{port}', f'tcp://127.0.0.1:{port}'
+
+def inproc_link(port):
+    """Same as link() but over 'inproc://' with OF_INPROC, for pipelines started with run_multi()."""
+    return (f'inproc://{port}',) * 2 if INPROC else link(port)
+
+def scratch_image():
+    """Return this thread's cleared 480x640 BGR scratch image. Reused across calls to skip a fresh ~900 KB zeroed
+    allocation per image, only valid until the next call on the same thread so encode it before then."""
+    img = getattr(_SCRATCH, 'img', None)
+    if img is None:
+        img = _SCRATCH.img = np.empty(FRAME_SHAPE, dtype=np.uint8)
+    img.fill(0)
+    return img
+
+def encode_image(img, format_ext, params=()):
+    """Encode an image in memory, same output as cv2.imwrite() but the buffer can be written anywhere (or reused)."""
+    ok, buf = cv2.imencode(f'.{format_ext}', img, params)
+    if not ok:
+        raise RuntimeError(f"failed to encode image as {format_ext!r}")
+    return buf
+
+def write_atomic(image_path, buf):
+    """Write an encoded image under a temporary name then rename it into place, so a directory watcher sees one
+    complete file appear (a single IN_MOVED_TO) and never a partially written one."""
+    tmp_path = os.path.join(os.path.dirname(image_path), f".{os.path.basename(image_path)}.tmp")
+    buf.tofile(tmp_path)
+    os.replace(tmp_path, image_path)
+
+def _write_image(item):
+    image_path, img = item
+    format_ext = image_path.rpartition('.')[2].lower()
+    encode_image(img, format_ext, JPG_PARAMS if format_ext in ('jpg', 'jpeg') else ()).tofile(image_path)
+    return image_path
+
+def write_images(items):
+    """Encode and write (path, image) items on a thread pool, the encoders release the GIL so the images are written in
+    parallel. JPEGs use JPG_PARAMS. Yields the paths in order as they are written."""
+    with ThreadPoolExecutor(max_workers=min(len(items), os.cpu_count() or 1) or 1) as executor:
+        yield from executor.map(_write_image, items)
+
+def _remove(entry):
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+    else:
+        os.unlink(entry.path)
+
+def reset_dir(path):
+    """Make `path` an empty directory. Nothing to do if it already is one, otherwise its entries are removed in place
+    (in parallel when there are many, unlink releases the GIL) instead of removing and recreating the directory."""
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        os.makedirs(path)
+        return
+
+    if len(entries) > 64:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(_remove, entries))
+    else:
+        for entry in entries:
+            _remove(entry)
+
+_SIGNATURE_NAME = '.images.sig'  # hidden, ImageIn skips it
+
+def image_set_signature(script_path, *params):
+    """Signature of a deterministic set of demo images: the script drawing them, this module (encoding), the OpenCV
+    version and any `params`. Editing either file changes it, so a stale image set is never reused."""
+    sig = hashlib.blake2b(digest_size=16)
+    for path in (script_path, __file__):
+        with open(path, 'rb') as f:
+            sig.update(f.read())
+    sig.update(repr((cv2.__version__, params)).encode())
+    return sig.hexdigest()
+
+def mark_image_set(signature, image_paths):
+    """Record in each directory of `image_paths` that its images were written with `signature`. Call after they are
+    all written, an interrupted run leaves no record and is redone."""
+    names = {}
+    for image_path in image_paths:
+        names.setdefault(os.path.dirname(image_path), []).append(os.path.basename(image_path))
+    for path, dir_names in names.items():
+        with open(os.path.join(path, _SIGNATURE_NAME), 'w') as f:
+            f.write('\n'.join([signature, *dir_names]))
+
+def has_image_set(path, signature):
+    """Whether directory `path` still has all the images a previous mark_image_set() with `signature` recorded."""
+    try:
+        with open(os.path.join(path, _SIGNATURE_NAME)) as f:
+            recorded_signature, *names = f.read().split('\n')
+    except OSError:
+        return False
+    return recorded_signature == signature and all(os.path.isfile(os.path.join(path, name)) for name in names)
+
+def label_patches(specs):
+    """Rasterize constant labels (text, origin, scale, color) once into patches just big enough for them, clipped to
+    the frame. Returns [(x, y, patch), ...] for blit_labels()."""
+    labels = []
+    for text, org, scale, color in specs:
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)
+        x, y = org[0] - 2, org[1] - h - 2
+        patch = np.zeros((h + baseline + 4, w + 4, 3), dtype=np.uint8)
+        cv2.putText(patch, text, (org[0] - x, org[1] - y), cv2.FONT_HERSHEY_SIMPLEX, scale, color, 2)
+        patch = patch[: max(0, FRAME_SHAPE[0] - y), : max(0, FRAME_SHAPE[1] - x)]  # off-frame part is never seen
+        if patch.size:
+            labels.append((x, y, patch))
+    return labels
+
+def blit_labels(img, labels):
+    """Draw pre-rasterized labels over the image, the text wins over the shapes below it. Matches cv2.putText()
+    exactly where those shapes are in pure colors (channels 0 or 255) as they are here."""
+    for x, y, patch in labels:
+        roi = img[y : y + patch.shape[0], x : x + patch.shape[1]]
+        np.maximum(roi, patch, out=roi)
+
+def shape_mask(draw):
+    """Rasterize a shape once with `draw(canvas)` (drawing in color 255) and crop it to its bounding box. Returns
+    (x, y, mask) for fill_shape()."""
+    canvas = np.zeros(FRAME_SHAPE[:2], dtype=np.uint8)
+    draw(canvas)
+    ys, xs = np.nonzero(canvas)
+    y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+    return int(x0), int(y0), canvas[y0:y1, x0:x1].astype(bool)
+
+def fill_shape(img, shape, color, dx=0, dy=0):
+    """Fill a precomputed shape mask offset by (dx, dy) with `color` in a single vectorized store, clipped to the
+    image. Same pixels as drawing the shape at that offset with cv2 (no anti-aliasing)."""
+    x, y, mask = shape
+    x, y = x + dx, y + dy
+    h, w = img.shape[:2]
+    mask = mask[max(0, -y) : max(0, h - y), max(0, -x) : max(0, w - x)]
+    if mask.size:
+        x, y = max(0, x), max(0, y)
+        img[y : y + mask.shape[0], x : x + mask.shape[1]][mask] = color
+
+def _warmup():
+    """The first cv2.putText() of a process builds OpenCV's Hershey font tables (~30 ms) and the first JPEG encode sets
+    up libjpeg. Do both at import so the timeline threads adding images at their announced times never pay for it."""
+    img = np.zeros((2, 2, 3), dtype=np.uint8)
+    cv2.putText(img, ' ', (0, 0), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 1)
+    cv2.imencode('.jpg', img, JPG_PARAMS)
+
+_warmup()
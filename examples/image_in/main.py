@@ -15,10 +15,15 @@ Then open http://localhost:8000 in your browser to see the images.
 
 import os, cv2
 import numpy as np
-from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.filters.util import Util
 from openfilter.filter_runtime.filters.webvis import Webvis
+from _demo_common import blit_labels, encode_image, inproc_link as link, label_patches, run_multi
+
+# Constant labels drawn on every sample image, rasterized once into patches just big enough for their text
+_LABELS = label_patches((
+    ("OpenFilter ImageIn Demo", (50, 350), 0.8, (255, 255, 255)),
+))
 
 def create_sample_images():
     """Create sample images for testing."""
@@ -37,15 +42,14 @@ def create_sample_images():
         
         cv2.rectangle(img, (50 + i*50, 50), (200 + i*50, 150), color, 3)
         cv2.circle(img, (400, 200 + i*30), 80, color, -1)
+        blit_labels(img, _LABELS)  # keep the static text on top of the shapes
         cv2.putText(img, text, (50, 300), 
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        cv2.putText(img, "OpenFilter ImageIn Demo", (50, 350), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
         
         # Save the image in different formats
         format_ext = formats[i % len(formats)]
         image_path = os.path.join(test_dir, f"sample_image_{i+1}.{format_ext}")
-        cv2.imwrite(image_path, img)
+        encode_image(img, format_ext).tofile(image_path)
         print(f"Created sample image: {image_path}")
     
     return test_dir
@@ -63,25 +67,25 @@ def main():
     print("Press Ctrl+C to stop the pipeline")
     
     # Run the pipeline
-    Filter.run_multi([
+    run_multi([
         # ImageIn: Read images from the test directory with looping
         (ImageIn, dict(
             sources=f'file://{test_dir}!loop!maxfps=2',
-            outputs='tcp://*:5550',
+            outputs=link(5550)[0],
             loop=True,  # Infinite loop
             poll_interval=2.0,  # Check for new images every 2 seconds
         )),
         
         # Util: Apply some transformations to the images
         (Util, dict(
-            sources='tcp://127.0.0.1:5550',
-            outputs='tcp://*:5552',
+            sources=link(5550)[1],
+            outputs=link(5552)[0],
             xforms='resize 640x480, box 0.1+0.1x0.3x0.2#ff0000',  # Resize and add red box
         )),
         
         # Webvis: Display images in web browser
         (Webvis, dict(
-            sources='tcp://127.0.0.1:5552',
+            sources=link(5552)[1],
             host='127.0.0.1',
             port=8000,
         )),
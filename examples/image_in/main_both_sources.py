@@ -22,10 +22,17 @@ import os, cv2
 import numpy as np
 import sys
 import argparse
-from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.filters.util import Util
 from openfilter.filter_runtime.filters.webvis import Webvis
+from _demo_common import blit_labels, inproc_link as link, label_patches, run_multi, write_images
+
+# Constant labels drawn on every sample image, rasterized once into patches just big enough for their text
+_LABELS = label_patches((
+    ("LOCAL SOURCE", (50, 350), 0.8, (255, 255, 255)),
+    ("FPS: FAST (1.0)", (50, 400), 0.6, (255, 255, 255)),
+    ("Topic: local", (50, 430), 0.6, (255, 255, 255)),
+))
 
 def create_sample_images():
     """Create sample images for local testing with more images to see FPS effect."""
@@ -36,6 +43,7 @@ def create_sample_images():
     # Create 6 test images to make FPS effect more visible
     colors = [(0, 255, 0), (255, 0, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
     formats = ['jpg', 'png', 'bmp']
+    items = []
     
     for i in range(6):
         img = np.zeros((480, 640, 3), dtype=np.uint8)
@@ -46,19 +54,16 @@ def create_sample_images():
         
         cv2.rectangle(img, (50 + (i%3)*50, 50 + (i//3)*100), (200 + (i%3)*50, 150 + (i//3)*100), color, 3)
         cv2.circle(img, (400, 200 + i*20), 60, color, -1)
+        blit_labels(img, _LABELS)  # keep the static text on top of the shapes
         cv2.putText(img, text, (50, 300), 
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        cv2.putText(img, "LOCAL SOURCE", (50, 350), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        cv2.putText(img, f"FPS: FAST (1.0)", (50, 400), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        cv2.putText(img, f"Topic: local", (50, 430), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         
         # Save the image in different formats
         format_ext = formats[i % len(formats)]
         image_path = os.path.join(test_dir, f"local_sample_{i+1:02d}.{format_ext}")
-        cv2.imwrite(image_path, img)
+        items.append((image_path, img))
+
+    for image_path in write_images(items):
         print(f"Created local sample image: {image_path}")
     
     return test_dir
@@ -89,27 +94,27 @@ def main():
     print("Press Ctrl+C to stop the pipeline")
     
     # Run the pipeline
-    Filter.run_multi([
+    run_multi([
         # ImageIn: Read images from BOTH local and GCS sources with different topics
         (ImageIn, dict(
             sources=[
                 f'file://{test_dir}!loop!maxfps=2.0;local', 
                 f'{args.gcs_path}!loop!maxfps=1.0;cloud'
             ],
-            outputs='tcp://*:5550',
+            outputs=link(5550)[0],
             poll_interval=3.0,  # Check for new images every 3 seconds
         )),
         
         # Util: Apply transformations - add different colored borders for each topic
         (Util, dict(
-            sources='tcp://127.0.0.1:5550',
-            outputs='tcp://*:5552',
+            sources=link(5550)[1],
+            outputs=link(5552)[0],
             xforms='resize 640x480',  # Just resize, images already have identifying text
         )),
         
         # Webvis: Display mixed images from both sources
         (Webvis, dict(
-            sources='tcp://127.0.0.1:5552',
+            sources=link(5552)[1],
             host='127.0.0.1',
             port=8000,
         )),
@@ -20,30 +20,31 @@ Press Ctrl+C to stop the pipeline.
 
 import os
 import time
-import shutil
 import threading
 import cv2
-import numpy as np
-from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.filters.util import Util
 from openfilter.filter_runtime.filters.webvis import Webvis
+from _demo_common import (blit_labels, encode_image, inproc_link as link, label_patches, reset_dir, run_multi,
+    scratch_image, write_atomic)
+
+# Constant header pre-rasterized once, blitted over each image's shapes
+_HDR_LABELS = label_patches((
+    ("Scenario 1: Empty Start", (50, 350), 0.8, (255, 255, 255)),
+))
 
 def create_test_directory():
     """Create an empty test directory."""
     test_dir = "test_images"
     
-    # Remove directory if it exists and recreate it empty
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
-    
-    os.makedirs(test_dir, exist_ok=True)
+    # Empty the directory, or create it if it doesn't exist, it is shared with the other scenarios and user images
+    reset_dir(test_dir)
     print(f"Created empty test directory: {test_dir}")
     return test_dir
 
 def create_sample_image(test_dir, image_num):
     """Create a sample image and save it to the test directory."""
-    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    img = scratch_image()
     
     # Draw different shapes and text for each image
     colors = [(0, 255, 0), (255, 0, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255)]
@@ -52,16 +53,15 @@ def create_sample_image(test_dir, image_num):
     
     cv2.rectangle(img, (50 + image_num*20, 50), (200 + image_num*20, 150), color, 3)
     cv2.circle(img, (400, 200 + image_num*30), 80, color, -1)
+    blit_labels(img, _HDR_LABELS)  # static header on top of the shapes, white text wins
     cv2.putText(img, text, (50, 300), 
                 cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-    cv2.putText(img, "Scenario 1: Empty Start", (50, 350), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
     cv2.putText(img, f"Added at: {time.strftime('%H:%M:%S')}", (50, 400), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
     
     # Save the image
     image_path = os.path.join(test_dir, f"dynamic_image_{image_num}.jpg")
-    cv2.imwrite(image_path, img)
+    write_atomic(image_path, encode_image(img, 'jpg'))
     print(f"Created image: {image_path}")
     return image_path
 
@@ -75,13 +75,17 @@ def image_addition_thread(test_dir, stop_event):
         print(f"  {delay}s: Will add image {i+1}")
     
     try:
-        for i, delay in enumerate(image_times):
+        # Deadlines are relative to a single start time so sleeps don't accumulate, and waiting on the event instead
+        # of time.sleep() lets a stop interrupt the wait immediately
+        start = time.monotonic()
+        for i, deadline in enumerate(image_times):
+            remaining = deadline - (time.monotonic() - start)
+            if remaining > 0:
+                stop_event.wait(remaining)
             if stop_event.is_set():
                 break
-            time.sleep(delay)
-            if not stop_event.is_set():
-                create_sample_image(test_dir, i+1)
-                print(f"\n[{time.strftime('%H:%M:%S')}] Added image {i+1} - Pipeline should pick it up automatically!")
+            create_sample_image(test_dir, i+1)
+            print(f"\n[{time.strftime('%H:%M:%S')}] Added image {i+1} - Pipeline should pick it up automatically!")
             
     except Exception as e:
         print(f"Error in image addition thread: {e}")
@@ -110,25 +114,26 @@ def simulate_image_addition(test_dir):
     
     try:
         # Start the pipeline
-        Filter.run_multi([
+        run_multi([
             # ImageIn: Read images from the test directory
             (ImageIn, dict(
                 sources=f'file://{test_dir}!loop!maxfps=0.5',  # 1 image every 2 seconds
-                outputs='tcp://*:5550',
+                outputs=link(5550)[0],
                 loop=True,  # Infinite loop
-                poll_interval=1.0,  # Check for new images every 1 second
+                watch='inotify',  # Pick up new images as soon as they are written (Linux, others fall back to polling)
+                poll_interval=1.0,  # Check for new images every 1 second when polling
             )),
             
             # Util: Apply some transformations to the images
             (Util, dict(
-                sources='tcp://127.0.0.1:5550',
-                outputs='tcp://*:5552',
+                sources=link(5550)[1],
+                outputs=link(5552)[0],
                 xforms='resize 640x480, box 0.1+0.1x0.3x0.2#00ff00',  # Resize and add green box
             )),
             
             # Webvis: Display images in web browser
             (Webvis, dict(
-                sources='tcp://127.0.0.1:5552',
+                sources=link(5552)[1],
                 host='127.0.0.1',
                 port=8000,
             )),
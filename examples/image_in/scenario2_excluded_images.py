@@ -21,7 +21,7 @@ Press Ctrl+C to stop the pipeline.
 
 import os
 import time
-import shutil
+import queue
 import threading
 import cv2
 import numpy as np
@@ -29,20 +29,32 @@ from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.filters.util import Util
 from openfilter.filter_runtime.filters.webvis import Webvis
+from _demo_common import (
+    FRAME_SHAPE, JPG_PARAMS, blit_labels, encode_image, fill_shape, label_patches, link, reset_dir, scratch_image,
+    shape_mask, write_atomic, write_images,
+)
+
+# Text that is the same on every image of a kind, rasterized once at import
+_EXCLUDED_LABELS = label_patches((
+    ("This image will be IGNORED", (50, 350), 0.8, (255, 255, 255)),
+    ("Pattern: *.jpg only", (50, 400), 0.6, (255, 255, 255)),
+))
+_MATCHING_LABELS = label_patches((
+    ("Scenario 2: Dynamic Changes", (50, 350), 0.8, (255, 255, 255)),
+    ("Pattern: *.jpg - WILL BE PROCESSED", (50, 500), 0.5, (0, 255, 0)),  # below the frame, clipped away
+))
 
 def create_test_directory_with_excluded_images():
     """Create test directory with images that will be excluded by pattern."""
     test_dir = "test_images"
     
-    # Remove directory if it exists and recreate it
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
-    
-    os.makedirs(test_dir, exist_ok=True)
+    # Empty the directory, or create it if it doesn't exist
+    reset_dir(test_dir)
     print(f"Created test directory: {test_dir}")
     
     # Create images that will be EXCLUDED (don't match the pattern)
     excluded_formats = ['bmp', 'png', 'tiff']
+    jobs = []
     for i in range(3):
         img = np.zeros((480, 640, 3), dtype=np.uint8)
         
@@ -54,44 +66,56 @@ def create_test_directory_with_excluded_images():
         cv2.circle(img, (400, 200), 80, color, -1)
         cv2.putText(img, text, (50, 300), 
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        cv2.putText(img, "This image will be IGNORED", (50, 350), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        cv2.putText(img, "Pattern: *.jpg only", (50, 400), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        blit_labels(img, _EXCLUDED_LABELS)
         
         # Save in excluded format
         format_ext = excluded_formats[i % len(excluded_formats)]
         image_path = os.path.join(test_dir, f"excluded_image_{i+1}.{format_ext}")
-        cv2.imwrite(image_path, img)
+        jobs.append((image_path, img))
+
+    for image_path in write_images(jobs):
         print(f"Created EXCLUDED image: {image_path}")
     
     return test_dir
 
+# Outline and disc of the matching images for image_num 0, each image offsets them
+_MATCHING_RECT = shape_mask(lambda c: cv2.rectangle(c, (50, 50), (200, 150), 255, 3))
+_MATCHING_DISC = shape_mask(lambda c: cv2.circle(c, (400, 200), 80, 255, -1))
+
+# Everything but the "Added at" time of a matching image, rendered once per (image_num, phase) since re-added
+# images only differ in that
+_MATCHING_BASES = {}
+
+def _matching_base(image_num, phase):
+    if (base := _MATCHING_BASES.get((image_num, phase))) is None:
+        base = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+
+        # Draw different shapes and text for each image
+        colors = [(0, 255, 0), (255, 0, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255)]
+        color = colors[image_num % len(colors)]
+        text = f"MATCHING Image {image_num}"
+
+        fill_shape(base, _MATCHING_RECT, color, dx=image_num*20)
+        fill_shape(base, _MATCHING_DISC, color, dy=image_num*30)
+        cv2.putText(base, text, (50, 300), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.putText(base, f"Phase: {phase}", (50, 400), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        blit_labels(base, _MATCHING_LABELS)
+        _MATCHING_BASES[(image_num, phase)] = base
+
+    return base
+
 def create_matching_image(test_dir, image_num, phase=""):
     """Create a sample image that matches the pattern (*.jpg)."""
-    img = np.zeros((480, 640, 3), dtype=np.uint8)
-    
-    # Draw different shapes and text for each image
-    colors = [(0, 255, 0), (255, 0, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255)]
-    color = colors[image_num % len(colors)]
-    text = f"MATCHING Image {image_num}"
-    
-    cv2.rectangle(img, (50 + image_num*20, 50), (200 + image_num*20, 150), color, 3)
-    cv2.circle(img, (400, 200 + image_num*30), 80, color, -1)
-    cv2.putText(img, text, (50, 300), 
-                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-    cv2.putText(img, "Scenario 2: Dynamic Changes", (50, 350), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-    cv2.putText(img, f"Phase: {phase}", (50, 400), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-    cv2.putText(img, f"Added at: {time.strftime('%H:%M:%S')}", (50, 450), 
+    img = scratch_image()
+    np.copyto(img, _matching_base(image_num, phase))
+    cv2.putText(img, f"Added at: {time.strftime('%H:%M:%S')}", (50, 450),  # clear of the shapes and labels
                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-    cv2.putText(img, "Pattern: *.jpg - WILL BE PROCESSED", (50, 500), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
     
     # Save as JPG (matches pattern)
     image_path = os.path.join(test_dir, f"matching_image_{image_num}.jpg")
-    cv2.imwrite(image_path, img)
+    write_atomic(image_path, encode_image(img, 'jpg', JPG_PARAMS))
     print(f"Created MATCHING image: {image_path} (Phase: {phase})")
     return image_path
 
@@ -107,7 +131,7 @@ def remove_matching_image(test_dir, image_num):
 def image_dynamic_changes_thread(test_dir, stop_event):
     """Thread function to add, remove, and re-add matching images over time."""
     
-    # Timeline: (action, time, image_num, description)
+    # Timeline: (action, seconds after start, image_num, description)
     timeline = [
         ("add", 8, 1, "First batch - Add image 1"),
         ("add", 12, 2, "First batch - Add image 2"),
@@ -123,26 +147,45 @@ def image_dynamic_changes_thread(test_dir, stop_event):
     ]
     
     print("\nDynamic Timeline:")
-    for action, delay, image_num, description in timeline:
-        print(f"  {delay}s: {description}")
+    for action, at, image_num, description in timeline:
+        print(f"  {at}s: {description}")
     
+    # Rendering and encoding happen on a worker fed through a small bounded queue so the timeline thread only sleeps
+    # and enqueues. Removes go through the same queue so they can never overtake the add they follow.
+    jobs = queue.Queue(maxsize=4)
+    worker = threading.Thread(target=image_changes_worker, args=(test_dir, jobs, stop_event), daemon=True)
+    worker.start()
+
     try:
-        for action, delay, image_num, description in timeline:
-            if stop_event.is_set():
+        # Times are from a single start so they don't drift by however long each step took to enqueue
+        start = time.monotonic()
+        for action, at, image_num, description in timeline:
+            if stop_event.wait(max(0, start + at - time.monotonic())):
                 break
-            time.sleep(delay)
-            if not stop_event.is_set():
-                if action == "add":
-                    create_matching_image(test_dir, image_num, f"Phase {action}")
-                    print(f"\n[{time.strftime('%H:%M:%S')}] {description} - Pipeline should pick it up!")
-                elif action == "remove":
-                    if remove_matching_image(test_dir, image_num):
-                        print(f"\n[{time.strftime('%H:%M:%S')}] {description} - Pipeline should stop showing it!")
-                    else:
-                        print(f"\n[{time.strftime('%H:%M:%S')}] {description} - Image not found to remove")
-            
-    except Exception as e:
-        print(f"Error in image changes thread: {e}")
+            jobs.put((action, image_num, description))
+
+    finally:
+        jobs.put(None)
+        worker.join(timeout=2)
+
+def image_changes_worker(test_dir, jobs, stop_event):
+    """Apply (action, image_num, description) jobs from the timeline in order until a None job is received. Jobs still
+    queued when the demo is stopped are dropped instead of rendered."""
+    while (job := jobs.get()) is not None:
+        if stop_event.is_set():
+            continue
+        action, image_num, description = job
+        try:
+            if action == "add":
+                create_matching_image(test_dir, image_num, f"Phase {action}")
+                print(f"\n[{time.strftime('%H:%M:%S')}] {description} - Pipeline should pick it up!")
+            elif action == "remove":
+                if remove_matching_image(test_dir, image_num):
+                    print(f"\n[{time.strftime('%H:%M:%S')}] {description} - Pipeline should stop showing it!")
+                else:
+                    print(f"\n[{time.strftime('%H:%M:%S')}] {description} - Image not found to remove")
+        except Exception as e:
+            print(f"Error in image changes thread: {e}")
 
 def simulate_pattern_matching_scenario(test_dir):
     """Simulate the pattern matching scenario with dynamic changes."""
@@ -176,21 +219,23 @@ def simulate_pattern_matching_scenario(test_dir):
             # ImageIn: Read images from the test directory with pattern restriction
             (ImageIn, dict(
                 sources=f'file://{test_dir}!loop!pattern=*.jpg!maxfps=0.5',  # Only .jpg files, 1 image every 2 seconds
-                outputs='tcp://*:5550',
+                outputs=link(5550)[0],
                 loop=True,  # Infinite loop
-                poll_interval=1.0,  # Check for new images every 1 second
+                watch='inotify',  # Pick up new images as soon as they are written (Linux, others fall back to polling)
+                poll_interval=1.0,  # Check for new images every 1 second when polling
+                poll_interval_max=8.0,  # Only if inotify is unavailable and polling: back off to 8 s when idle
             )),
             
             # Util: Apply some transformations to the images
             (Util, dict(
-                sources='tcp://127.0.0.1:5550',
-                outputs='tcp://*:5552',
+                sources=link(5550)[1],
+                outputs=link(5552)[0],
                 xforms='resize 640x480, box 0.1+0.1x0.3x0.2#ff00ff',  # Resize and add magenta box
             )),
             
             # Webvis: Display images in web browser
             (Webvis, dict(
-                sources='tcp://127.0.0.1:5552',
+                sources=link(5552)[1],
                 host='127.0.0.1',
                 port=8000,
             )),
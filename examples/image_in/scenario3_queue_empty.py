@@ -22,29 +22,41 @@ Press Ctrl+C to stop the pipeline.
 
 import os
 import time
-import shutil
 import threading
 import cv2
-import numpy as np
 from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.filters.util import Util
 from openfilter.filter_runtime.filters.webvis import Webvis
+from _demo_common import (
+    JPG_PARAMS, blit_labels, encode_image, fill_shape, label_patches, link, reset_dir, scratch_image, shape_mask,
+    write_atomic,
+)
+
+# Text that is the same on every image of a kind, rasterized once at import
+_INITIAL_LABELS = label_patches((
+    ("Scenario 3: Queue Empty", (50, 350), 0.8, (255, 255, 255)),
+    ("Pre-loaded images", (50, 400), 0.6, (255, 255, 255)),
+))
+_RECOVERY_LABELS = label_patches((
+    ("Pipeline RECOVERY!", (50, 450), 0.8, (0, 255, 0)),
+))
+
+# Outline and disc of the recovery images for image_num 0, each image offsets them
+_RECOVERY_RECT = shape_mask(lambda c: cv2.rectangle(c, (50, 50), (250, 150), 255, 3))
+_RECOVERY_DISC = shape_mask(lambda c: cv2.circle(c, (400, 250), 80, 255, -1))
 
 def create_test_directory_with_initial_images():
     """Create test directory with a few initial images."""
     test_dir = "test_images"
     
-    # Remove directory if it exists and recreate it
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
-    
-    os.makedirs(test_dir, exist_ok=True)
+    # Empty the directory, or create it if it doesn't exist
+    reset_dir(test_dir)
     print(f"Created test directory: {test_dir}")
     
     # Create 3 initial images
     for i in range(3):
-        img = np.zeros((480, 640, 3), dtype=np.uint8)
+        img = scratch_image()
         
         # Draw initial image content
         colors = [(0, 255, 0), (255, 0, 0), (0, 0, 255)]
@@ -55,41 +67,37 @@ def create_test_directory_with_initial_images():
         cv2.circle(img, (400, 200 + i*40), 60, color, -1)
         cv2.putText(img, text, (50, 300), 
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        cv2.putText(img, "Scenario 3: Queue Empty", (50, 350), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        cv2.putText(img, "Pre-loaded images", (50, 400), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        blit_labels(img, _INITIAL_LABELS)
         
         # Save the image
         image_path = os.path.join(test_dir, f"initial_image_{i+1}.jpg")
-        cv2.imwrite(image_path, img)
+        cv2.imwrite(image_path, img, JPG_PARAMS)
         print(f"Created initial image: {image_path}")
     
     return test_dir
 
 def create_recovery_image(test_dir, image_num, phase="Recovery"):
     """Create a recovery image to show pipeline recovery."""
-    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    img = scratch_image()
     
     # Draw recovery image content
     colors = [(255, 255, 0), (255, 0, 255), (0, 255, 255)]
     color = colors[image_num % len(colors)]
     text = f"Recovery Image {image_num}"
     
-    cv2.rectangle(img, (50 + image_num*20, 50), (250 + image_num*20, 150), color, 3)
-    cv2.circle(img, (400, 250 + image_num*30), 80, color, -1)
+    fill_shape(img, _RECOVERY_RECT, color, dx=image_num*20)
+    fill_shape(img, _RECOVERY_DISC, color, dy=image_num*30)
     cv2.putText(img, text, (50, 300), 
                 cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
     cv2.putText(img, f"Phase: {phase}", (50, 350), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
     cv2.putText(img, f"Added at: {time.strftime('%H:%M:%S')}", (50, 400), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-    cv2.putText(img, "Pipeline RECOVERY!", (50, 450), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+    blit_labels(img, _RECOVERY_LABELS)
     
     # Save the image
     image_path = os.path.join(test_dir, f"recovery_image_{image_num}.jpg")
-    cv2.imwrite(image_path, img)
+    write_atomic(image_path, encode_image(img, 'jpg', JPG_PARAMS))
     print(f"Created recovery image: {image_path}")
     return image_path
 
@@ -107,34 +115,31 @@ def queue_empty_demonstration_thread(test_dir, stop_event):
     print("="*60)
     
     try:
+        # Times are from a single start so they don't drift by however long each step took, and waiting on the event
+        # instead of time.sleep() lets a stop interrupt the wait immediately
+        start = time.monotonic()
+
+        def wait_until(at):
+            return stop_event.wait(max(0, start + at - time.monotonic()))
+
         # Wait for initial processing to complete
         print(f"\n[{time.strftime('%H:%M:%S')}] Waiting for initial images to process...")
-        time.sleep(10)  # Initial 3 images at 0.5 FPS = 6 seconds + buffer
+        if wait_until(10):  # Initial 3 images at 0.5 FPS = 6 seconds + buffer
+            return
         
         print(f"\n[{time.strftime('%H:%M:%S')}] *** QUEUE SHOULD BE EMPTY NOW ***")
         print("Pipeline status: IDLE but ALIVE (not crashed)")
         print("Waiting 10 seconds to demonstrate empty queue behavior...")
-        time.sleep(10)
         
         # Add recovery images
         recovery_times = [20, 30, 40]  # Total elapsed time
         for i, total_time in enumerate(recovery_times):
-            if stop_event.is_set():
+            if wait_until(total_time):
                 break
             
-            # We've already waited 20 seconds, so adjust sleep time
-            if i == 0:
-                sleep_time = 0  # We already waited 20 seconds total
-            else:
-                sleep_time = 10  # 10 seconds between recovery images
-            
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            
-            if not stop_event.is_set():
-                create_recovery_image(test_dir, i+1, "Recovery")
-                print(f"\n[{time.strftime('%H:%M:%S')}] *** ADDED RECOVERY IMAGE {i+1} ***")
-                print("Pipeline should AUTOMATICALLY resume processing!")
+            create_recovery_image(test_dir, i+1, "Recovery")
+            print(f"\n[{time.strftime('%H:%M:%S')}] *** ADDED RECOVERY IMAGE {i+1} ***")
+            print("Pipeline should AUTOMATICALLY resume processing!")
                 
     except Exception as e:
         print(f"Error in demonstration thread: {e}")
@@ -172,21 +177,23 @@ def simulate_queue_empty_scenario(test_dir):
             # ImageIn: Read images with NO looping
             (ImageIn, dict(
                 sources=f'file://{test_dir}!maxfps=2',  # No loop - process once only
-                outputs='tcp://*:5550',
+                outputs=link(5550)[0],
                 loop=False,  # KEY: No looping - process each image once
-                poll_interval=1.0,  # Check for new images every 1 second
+                watch='inotify',  # Pick up new images as soon as they are written (Linux, others fall back to polling)
+                poll_interval=1.0,  # Check for new images every 1 second when polling
+                poll_interval_max=8.0,  # Only if inotify is unavailable and polling: back off to 8 s when idle
             )),
             
             # Util: Apply some transformations to the images
             (Util, dict(
-                sources='tcp://127.0.0.1:5550',
-                outputs='tcp://*:5552',
+                sources=link(5550)[1],
+                outputs=link(5552)[0],
                 xforms='resize 640x480, box 0.1+0.1x0.3x0.2#ffff00',  # Resize and add yellow box
             )),
             
             # Webvis: Display images in web browser
             (Webvis, dict(
-                sources='tcp://127.0.0.1:5552',
+                sources=link(5552)[1],
                 host='127.0.0.1',
                 port=8000,
             )),
@@ -22,7 +22,6 @@ Press Ctrl+C to stop the pipeline.
 
 import os
 import time
-import shutil
 import threading
 import cv2
 import numpy as np
@@ -30,72 +29,71 @@ from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.filters.util import Util
 from openfilter.filter_runtime.filters.webvis import Webvis
+from _demo_common import has_image_set, image_set_signature, link, mark_image_set, reset_dir, write_images
 
-def create_fast_images(fast_dir):
-    """Create images for the fast stream."""
-    os.makedirs(fast_dir, exist_ok=True)
+def _stream_template(color, title, topic, every):
+    """Draw everything a stream's images have in common once, each image copies it and adds only its number."""
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
     
-    for i in range(8):
-        img = np.zeros((480, 640, 3), dtype=np.uint8)
-        
-        # Fast stream - green theme
-        color = (0, 255, 0)  # Green
-        text = f"FAST #{i+1}"
-        
-        cv2.rectangle(img, (50, 50), (300, 200), color, 3)
-        cv2.circle(img, (400, 300), 80, color, -1)
-        cv2.putText(img, text, (50, 250), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
-        cv2.putText(img, "FAST STREAM: 2.0 FPS", (50, 300), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        cv2.putText(img, "Topic: fast", (50, 350), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(img, "1 image every 0.5 seconds", (50, 400), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        image_path = os.path.join(fast_dir, f"fast_image_{i+1}.jpg")
-        cv2.imwrite(image_path, img)
-        print(f"Created fast image: {image_path}")
+    cv2.rectangle(img, (50, 50), (300, 200), color, 3)
+    cv2.circle(img, (400, 300), 80, color, -1)
+    cv2.putText(img, title, (50, 300), 
+                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    cv2.putText(img, topic, (50, 350), 
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    cv2.putText(img, every, (50, 400), 
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    
+    return img
 
-def create_slow_images(slow_dir):
-    """Create images for the slow stream."""
-    os.makedirs(slow_dir, exist_ok=True)
+def _stream_images(template, label, out_dir, name, count):
+    """Copy the template per image and draw its number, returns [(path, image), ...] to write. The number (above the
+    title and left of the circle) doesn't overlap anything in the template so the draw order doesn't matter."""
+    os.makedirs(out_dir, exist_ok=True)
+    items = []
     
-    for i in range(4):
-        img = np.zeros((480, 640, 3), dtype=np.uint8)
-        
-        # Slow stream - red theme
-        color = (0, 0, 255)  # Red
-        text = f"SLOW #{i+1}"
-        
-        cv2.rectangle(img, (50, 50), (300, 200), color, 3)
-        cv2.circle(img, (400, 300), 80, color, -1)
-        cv2.putText(img, text, (50, 250), 
+    for i in range(count):
+        img = template.copy()
+        cv2.putText(img, f"{label} #{i+1}", (50, 250), 
                     cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
-        cv2.putText(img, "SLOW STREAM: 1.0 FPS", (50, 300), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        cv2.putText(img, "Topic: slow", (50, 350), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(img, "1 image every 1 second", (50, 400), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        image_path = os.path.join(slow_dir, f"slow_image_{i+1}.jpg")
-        cv2.imwrite(image_path, img)
-        print(f"Created slow image: {image_path}")
+        items.append((os.path.join(out_dir, f"{name}_image_{i+1}.jpg"), img))
+    
+    return items
+
+def create_fast_images(fast_dir):
+    """Draw the images for the fast stream, returns [(path, image), ...] to write."""
+    # Fast stream - green theme
+    template = _stream_template((0, 255, 0), "FAST STREAM: 2.0 FPS", "Topic: fast", "1 image every 0.5 seconds")
+    return _stream_images(template, "FAST", fast_dir, "fast", 8)
+
+def create_slow_images(slow_dir):
+    """Draw the images for the slow stream, returns [(path, image), ...] to write."""
+    # Slow stream - red theme
+    template = _stream_template((0, 0, 255), "SLOW STREAM: 1.0 FPS", "Topic: slow", "1 image every 1 second")
+    return _stream_images(template, "SLOW", slow_dir, "slow", 4)
 
 def create_test_directories():
     """Create separate directories for fast and slow streams."""
-    # Clean up and create directories
-    for dir_name in ["fast_images", "slow_images"]:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
-    
     fast_dir = "fast_images"
     slow_dir = "slow_images"
     
-    create_fast_images(fast_dir)
-    create_slow_images(slow_dir)
+    # The images are always the same, so a previous run's are reused unless this script changed since
+    signature = image_set_signature(__file__)
+    if has_image_set(fast_dir, signature) and has_image_set(slow_dir, signature):
+        print(f"Reusing the images already in {fast_dir}/ and {slow_dir}/")
+        return fast_dir, slow_dir
+    
+    # Empty the directories, or create them if they don't exist
+    reset_dir(fast_dir)
+    reset_dir(slow_dir)
+    
+    # Drawing is cheap, encoding and writing is not, so write both streams' images in parallel
+    image_paths = []
+    for image_path in write_images(create_fast_images(fast_dir) + create_slow_images(slow_dir)):
+        print(f"Created image: {image_path}")
+        image_paths.append(image_path)
     
+    mark_image_set(signature, image_paths)
     return fast_dir, slow_dir
 
 def timing_explanation_thread(stop_event):
@@ -127,12 +125,12 @@ def timing_explanation_thread(stop_event):
         (5, "Both streams finished - demonstrating independent FPS control")
     ]
     
-    for delay, message in timeline:
-        if stop_event.is_set():
-            break
-        time.sleep(delay)
-        if not stop_event.is_set():
-            print(f"\n[{time.strftime('%H:%M:%S')}] {message}")
+    # Times are seconds after start like the pattern above, waiting on the event wakes up as soon as the demo stops
+    start = time.monotonic()
+    for at, message in timeline:
+        if stop_event.wait(max(0, start + at - time.monotonic())):
+            return
+        print(f"\n[{time.strftime('%H:%M:%S')}] {message}")
 
 def simulate_multi_fps_scenario(fast_dir, slow_dir):
     """Simulate the multi-FPS scenario."""
@@ -166,20 +164,20 @@ def simulate_multi_fps_scenario(fast_dir, slow_dir):
             # ImageIn: Multiple sources with different FPS settings
             (ImageIn, dict(
                 sources=f'file://{fast_dir}!maxfps=2.0!loop;fast, file://{slow_dir}!maxfps=1.0!loop;slow',
-                outputs='tcp://*:5550',
+                outputs=link(5550)[0],
                 poll_interval=1.0,
             )),
             
             # Util: Add different colored boxes to distinguish streams
             (Util, dict(
-                sources='tcp://127.0.0.1:5550',
-                outputs='tcp://*:5552',
+                sources=link(5550)[1],
+                outputs=link(5552)[0],
                 xforms='resize 640x480',  # Just resize, images already have colored content
             )),
             
             # Webvis: Display mixed stream
             (Webvis, dict(
-                sources='tcp://127.0.0.1:5552',
+                sources=link(5552)[1],
                 host='127.0.0.1',
                 port=8000,
             )),
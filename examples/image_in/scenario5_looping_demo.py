@@ -19,8 +19,8 @@ Press Ctrl+C to stop the pipeline.
 """
 
 import os
+import sys
 import time
-import shutil
 import threading
 import cv2
 import numpy as np
@@ -28,20 +28,25 @@ from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.filters.util import Util
 from openfilter.filter_runtime.filters.webvis import Webvis
+from _demo_common import has_image_set, image_set_signature, link, mark_image_set, reset_dir, write_images
 
 def create_demo_images():
     """Create 3 simple demo images."""
     test_dir = "loop_demo_images"
     
-    # Remove directory if it exists and recreate it
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
+    # The images are always the same, so a previous run's are reused unless this script changed since
+    signature = image_set_signature(__file__)
+    if has_image_set(test_dir, signature):
+        print(f"Reusing the demo images already in {test_dir}/")
+        return test_dir
     
-    os.makedirs(test_dir, exist_ok=True)
+    # Empty the directory, or create it if it doesn't exist
+    reset_dir(test_dir)
     
     # Create 3 distinct images
     colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]  # Red, Green, Blue
     names = ["RED", "GREEN", "BLUE"]
+    items = []
     
     for i in range(3):
         img = np.zeros((480, 640, 3), dtype=np.uint8)
@@ -61,10 +66,14 @@ def create_demo_images():
         cv2.putText(img, "Loop Demo", (250, 350), 
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
         
-        image_path = os.path.join(test_dir, f"demo_image_{i+1}.jpg")
-        cv2.imwrite(image_path, img)
+        items.append((os.path.join(test_dir, f"demo_image_{i+1}.jpg"), img))
+    
+    image_paths = []
+    for image_path in write_images(items):  # encoded and written in parallel
         print(f"Created demo image: {image_path}")
+        image_paths.append(image_path)
     
+    mark_image_set(signature, image_paths)
     return test_dir
 
 def run_demo_phase(phase_name, sources_config, expected_duration):
@@ -83,25 +92,29 @@ def run_demo_phase(phase_name, sources_config, expected_duration):
             # ImageIn: With specific looping configuration
             (ImageIn, dict(
                 sources=sources_config,
-                outputs='tcp://*:5550',
+                outputs=link(5550)[0],
                 poll_interval=1.0,
             )),
             
             # Util: Add phase indicator
             (Util, dict(
-                sources='tcp://127.0.0.1:5550',
-                outputs='tcp://*:5552',
+                sources=link(5550)[1],
+                outputs=link(5552)[0],
                 xforms='resize 640x480',
             )),
             
             # Webvis: Display images
             (Webvis, dict(
-                sources='tcp://127.0.0.1:5552',
+                sources=link(5552)[1],
                 host='127.0.0.1',
                 port=8000,
             )),
         ])
         
+        elapsed = time.time() - start_time
+        print(f"\nPhase completed after {elapsed:.1f} seconds")
+        return True
+        
     except KeyboardInterrupt:
         elapsed = time.time() - start_time
         print(f"\nPhase interrupted after {elapsed:.1f} seconds")
@@ -144,7 +157,6 @@ def simulate_looping_demo(test_dir):
     
     for i, phase in enumerate(phases):
         print(f"\n🔄 Starting Phase {i+1}/3...")
-        time.sleep(2)  # Brief pause between phases
         
         completed = run_demo_phase(
             phase["name"], 
@@ -156,8 +168,9 @@ def simulate_looping_demo(test_dir):
             break
             
         if i < len(phases) - 1:  # Not the last phase
-            print(f"\nPhase {i+1} completed! Starting next phase in 3 seconds...")
-            time.sleep(3)
+            # run_multi() only returns once every filter process has exited and released its ports, so the next
+            # phase can start right away
+            print(f"\nPhase {i+1} completed! Starting next phase...")
     
     print("\nDemo completed!")
 
@@ -175,7 +188,9 @@ def main():
     print("• Phase 2: Finite looping (process 2 times)")
     print("• Phase 3: Infinite looping (process forever)")
     
-    input("\nPress Enter to start the demo (Ctrl+C to stop anytime)...")
+    # Only wait for a human when there is one, piped / CI runs or OPENFILTER_DEMO_AUTOSTART=1 start right away
+    if sys.stdin.isatty() and not os.getenv('OPENFILTER_DEMO_AUTOSTART'):
+        input("\nPress Enter to start the demo (Ctrl+C to stop anytime)...")
     
     # Start demo
     simulate_looping_demo(test_dir)
@@ -47,14 +47,14 @@ def build_pipeline(args):
         (VideoIn, dict(
             id="video_in",
             sources=f"{args.input}!resize=640x480lin!loop",
-            outputs="tcp://*:6000"
+            outputs=f"tcp://*:{args.base_port}"
         )),
         
         # Custom processor with MetricSpecs (business metrics)
         (CustomProcessor, CustomProcessorConfig(
             id="custom_processor",
-            sources="tcp://127.0.0.1:6000",
-            outputs="tcp://*:6002",
+            sources=f"tcp://127.0.0.1:{args.base_port}",
+            outputs=f"tcp://*:{args.base_port + 2}",
             detection_threshold=args.detection_threshold,
             max_detections=args.max_detections,
             add_confidence_scores=True,
@@ -65,8 +65,8 @@ def build_pipeline(args):
         # Custom visualizer without MetricSpecs (system metrics only)
         (CustomVisualizer, CustomVisualizerConfig(
             id="custom_visualizer",
-            sources="tcp://127.0.0.1:6002",
-            outputs="tcp://*:6004",
+            sources=f"tcp://127.0.0.1:{args.base_port + 2}",
+            outputs=f"tcp://*:{args.base_port + 4}",
             draw_detections=True,
             draw_confidence=True,
             draw_bounding_boxes=True,
@@ -76,9 +76,9 @@ def build_pipeline(args):
         
         (Webvis, dict(
             id="webvis",
-            sources="tcp://127.0.0.1:6004",
+            sources=f"tcp://127.0.0.1:{args.base_port + 4}",
             host="0.0.0.0",
-            port=8000,
+            port=args.webvis_port,
         ))
     ]
 
@@ -138,32 +138,48 @@ Examples:
             default=10,
             help="Maximum detections per frame (default: 10)"
         )
+        parser.add_argument(
+            "--base-port",
+            type=int,
+            default=6000,
+            help="First of the TCP ports the filters talk over, uses this one, +2 and +4 (default: 6000)"
+        )
+        parser.add_argument(
+            "--webvis-port",
+            type=int,
+            default=8000,
+            help="Port to serve the visualization on (default: 8000)"
+        )
         
         args = parser.parse_args()
         
-        # Log startup information
-        logger.info("🚀 Starting OpenFilter Observability Demo")
-        logger.info(f"📹 Video source: {args.input}")
-        logger.info(f"🎬 Output FPS: {args.fps}")
-        logger.info(f"🎯 Detection threshold: {args.detection_threshold}")
-        logger.info(f"🔢 Max detections: {args.max_detections}")
-        
         # Check observability configuration
         telemetry_enabled = os.getenv("TELEMETRY_EXPORTER_ENABLED", "false").lower() in ("true", "1")
         openlineage_url = os.getenv("OPENLINEAGE_URL")
         
+        # Build the pipeline
+        pipeline = build_pipeline(args)
+        
+        # Log startup information as one record, one handler write before the pipeline starts instead of one per line
+        startup = [
+            "🚀 Starting OpenFilter Observability Demo",
+            f"📹 Video source: {args.input}",
+            f"🎬 Output FPS: {args.fps}",
+            f"🎯 Detection threshold: {args.detection_threshold}",
+            f"🔢 Max detections: {args.max_detections}",
+        ]
+        
         if telemetry_enabled:
-            logger.info("✅ OpenTelemetry enabled - system metrics will be exported")
+            startup.append("✅ OpenTelemetry enabled - system metrics will be exported")
             if openlineage_url:
-                logger.info(f"✅ OpenLineage enabled - business metrics will be exported to {openlineage_url}")
+                startup.append(f"✅ OpenLineage enabled - business metrics will be exported to {openlineage_url}")
             else:
-                logger.info("ℹ️  OpenLineage not configured - business metrics will not be exported")
+                startup.append("ℹ️  OpenLineage not configured - business metrics will not be exported")
         else:
-            logger.info("ℹ️  OpenTelemetry disabled - no metrics will be exported")
+            startup.append("ℹ️  OpenTelemetry disabled - no metrics will be exported")
         
-        # Build and run the pipeline
-        pipeline = build_pipeline(args)
-        logger.info(f"🔗 Pipeline: {' → '.join([f[0].__name__ for f in pipeline])}")
+        startup.append(f"🔗 Pipeline: {' → '.join([f[0].__name__ for f in pipeline])}")
+        logger.info("\n".join(startup))
         
         Filter.run_multi(pipeline)
         
@@ -0,0 +1,16 @@
+"""
+Pytest fixtures for the observability demo tests, run them with `pytest examples/observability-demo` (add `-n 3` with
+pytest-xdist to run the pipelines at the same time, they use separate ports).
+"""
+
+from pathlib import Path
+
+import pytest
+
+from test_demo import ensure_sample_video
+
+
+@pytest.fixture(scope="session")
+def sample_video():
+    """Path of the sample video, created once for all the tests (and kept for later runs while it verifies)."""
+    return ensure_sample_video(Path(__file__).parent)
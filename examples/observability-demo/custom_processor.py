@@ -6,18 +6,23 @@ This filter demonstrates how to declare metrics using MetricSpec
 and shows automatic histogram bucket generation.
 """
 
-import random
 import time
 from typing import Dict, Any
+import numpy as np
 from openfilter.filter_runtime import Filter, Frame, FilterConfig
 from openfilter.observability import MetricSpec
 
+__all__ = ["CustomProcessorConfig", "CustomProcessor"]
+
 
 class CustomProcessorConfig(FilterConfig):
     """Configuration for the custom processor filter."""
     mq_log: str | bool | None = None
 
 
+CLASSES = ["person", "car", "bicycle", "dog"]
+
+
 class CustomProcessor(Filter):
     """Custom processor that simulates object detection and adds metrics."""
     
@@ -32,14 +37,14 @@ class CustomProcessor(Filter):
         MetricSpec(
             name="frames_with_detections", 
             instrument="counter",
-            value_fn=lambda d: 1 if d.get("detections") else 0
+            value_fn=lambda d: 1 if d.get("num_detections") else 0  # the scalar count process() stores, not the list
         ),
         
         # Histograms with auto-generated buckets
         MetricSpec(
             name="detections_per_frame",
             instrument="histogram",
-            value_fn=lambda d: len(d.get("detections", [])),
+            value_fn=lambda d: d.get("num_detections", 0),
             num_buckets=8  # Auto-generate 8 buckets for 0-50 detections
         ),
         MetricSpec(
@@ -67,37 +72,48 @@ class CustomProcessor(Filter):
     def setup(self, config):
         """Setup the filter."""
         self.config = config
+        self._rng = np.random.default_rng()
         print(f"[CustomProcessor] Setup complete with config: {config}")
     
+    def _simulate_detections(self, num_frames: int) -> list[tuple[dict, int, float]]:
+        """Fake detections for a batch of frames, for each one column-wise lists `{"class": [...], "confidence": [...],
+        "bbox": [[x1, y1, x2, y2], ...]}` with their count and average confidence. Each column is drawn for the whole
+        batch in one call and split per frame, the place a real batched detector call would go. Stored as is, no
+        dict per detection and the keys appear once in the JSON frame data. `.tolist()` gives plain Python numbers
+        for JSON."""
+        rng = self._rng
+        counts = rng.integers(0, 9, num_frames)
+        total = int(counts.sum())
+        splits = np.cumsum(counts)[:-1]
+        
+        confidences = np.split(rng.uniform(0.3, 0.95, total), splits)
+        classes = np.split(rng.integers(0, len(CLASSES), total), splits)
+        bboxes = np.split(rng.uniform(0, 1, (total, 4)), splits)
+        
+        return [
+            (
+                {
+                    "class": [CLASSES[c] for c in frame_classes.tolist()],
+                    "confidence": frame_confidences.tolist(),
+                    "bbox": frame_bboxes.tolist(),
+                },
+                len(frame_confidences),
+                float(frame_confidences.mean()) if len(frame_confidences) else 0.0,
+            )
+            for frame_confidences, frame_classes, frame_bboxes in zip(confidences, classes, bboxes)
+        ]
+    
     def process(self, frames: Dict[str, Frame]) -> Dict[str, Frame]:
         """Process frames and add detection data."""
         processed_frames = {}
         
-        for frame_id, frame in frames.items():
-            # Simulate object detection
-            num_detections = random.randint(0, 8)
-            detections = []
-            
-            if num_detections > 0:
-                # Generate fake detections
-                for i in range(num_detections):
-                    confidence = random.uniform(0.3, 0.95)
-                    detections.append({
-                        "id": i,
-                        "class": random.choice(["person", "car", "bicycle", "dog"]),
-                        "confidence": confidence,
-                        "bbox": [random.uniform(0, 1) for _ in range(4)]
-                    })
-            
-            # Calculate average confidence
-            avg_confidence = sum(d["confidence"] for d in detections) / len(detections) if detections else 0.0
-            
-            # Simulate processing time
-            processing_time = random.uniform(5.0, 45.0)
-            
-            # Calculate size ratio (simulated)
-            size_ratio = random.uniform(0.05, 0.8)
-            
+        # Simulate object detection for all the frames at once, and their processing times and size ratios
+        results = self._simulate_detections(len(frames))
+        processing_times, size_ratios = self._rng.uniform((5.0, 0.05), (45.0, 0.8), (len(frames), 2)).T.tolist()
+        
+        for (frame_id, frame), (detections, num_detections, avg_confidence), processing_time, size_ratio in zip(
+            frames.items(), results, processing_times, size_ratios
+        ):
             # Update frame data with detection results
             frame.data.update({
                 "detections": detections,
@@ -11,6 +11,8 @@ import numpy as np
 from typing import Dict, Any
 from openfilter.filter_runtime import Filter, Frame, FilterConfig
 
+__all__ = ["CustomVisualizerConfig", "CustomVisualizer"]
+
 
 class CustomVisualizerConfig(FilterConfig):
     """Configuration for the custom visualizer filter."""
@@ -31,38 +33,43 @@ class CustomVisualizer(Filter):
         
         for frame_id, frame in frames.items():
             if frame.image is not None:
-                # Get detection data from frame
+                # Get detection data from frame, column-wise as CustomProcessor emits it or a list of dicts
                 detections = frame.data.get("detections", [])
                 
-                # Create a copy of the image for drawing
-                overlay_image = frame.image.copy()
+                if isinstance(detections, dict):
+                    bboxes = detections.get("bbox", [])
+                    num_detections = len(bboxes)
+                    classes = detections.get("class") or ["unknown"] * num_detections
+                    confidences = detections.get("confidence") or [0.0] * num_detections
+                else:
+                    num_detections = len(detections)
+                    boxes = [detection for detection in detections if isinstance(detection, dict)]
+                    bboxes = [detection.get("bbox", [0, 0, 0.1, 0.1]) for detection in boxes]
+                    classes = [detection.get("class", "unknown") for detection in boxes]
+                    confidences = [detection.get("confidence", 0.0) for detection in boxes]
+                
+                # Draw straight on the image if it is already writable, only a readonly one is copied
+                frame = frame.rw_bgr
+                overlay_image = frame.image
+                h, w = overlay_image.shape[:2]
+                
+                # Convert all the normalized bounding boxes to pixel coordinates at once
+                pixel_bboxes = (np.array(bboxes, dtype=np.float64).reshape(-1, 4) * (w, h, w, h)).astype(np.int32)
+                pixel_bboxes = pixel_bboxes.tolist()
                 
                 # Draw detection boxes
-                for detection in detections:
-                    if isinstance(detection, dict):
-                        # Extract bounding box coordinates
-                        bbox = detection.get("bbox", [0, 0, 0.1, 0.1])
-                        confidence = detection.get("confidence", 0.0)
-                        class_name = detection.get("class", "unknown")
-                        
-                        # Convert normalized coordinates to pixel coordinates
-                        h, w = overlay_image.shape[:2]
-                        x1 = int(bbox[0] * w)
-                        y1 = int(bbox[1] * h)
-                        x2 = int(bbox[2] * w)
-                        y2 = int(bbox[3] * h)
-                        
-                        # Draw bounding box
-                        color = (0, 255, 0)  # Green
-                        cv2.rectangle(overlay_image, (x1, y1), (x2, y2), color, 2)
-                        
-                        # Draw label
-                        label = f"{class_name}: {confidence:.2f}"
-                        cv2.putText(overlay_image, label, (x1, y1-10), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+                color = (0, 255, 0)  # Green
+                for class_name, confidence, (x1, y1, x2, y2) in zip(classes, confidences, pixel_bboxes):
+                    # Draw bounding box
+                    cv2.rectangle(overlay_image, (x1, y1), (x2, y2), color, 2)
+                    
+                    # Draw label
+                    label = f"{class_name}: {confidence:.2f}"
+                    cv2.putText(overlay_image, label, (x1, y1-10), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
                 
                 # Add frame info overlay
-                info_text = f"Detections: {len(detections)}"
+                info_text = f"Detections: {num_detections}"
                 cv2.putText(overlay_image, info_text, (10, 30), 
                            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
 
@@ -5,82 +5,123 @@ Test script for the observability demo.
 This script tests the demo pipeline with different configurations.
 """
 
+import io
 import os
 import sys
+import shutil
+import signal
 import subprocess
-import time
-import logging
+import threading
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+
+if sys.platform != 'win32':
+    import fcntl
+
+# The harness locks the sample video with fcntl.flock and stops each app with its filter processes with os.killpg
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="POSIX only (fcntl.flock, os.killpg)")
+
 # Add the project root to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-def test_basic_run():
-    """Test basic run without observability."""
-    print("🧪 Testing basic run (no observability)...")
-
+def run_app(sample_video, base_port, webvis_port, env=None, until="video loop:", timeout=30):
+    """Run the demo app on its own ports (so several runs can go at the same time) until it logs `until`, by default
+    once the looping input video has gone all the way through the pipeline, then stop it like Ctrl+C would. Output
+    is drained as it comes into a bounded tail kept for the error message. Returns (ok, output tail)."""
     # Get the directory where this test file is located
     test_dir = Path(__file__).parent
 
-    result = subprocess.run([
+    # Own session so the filter processes the app starts can be stopped with it as a group
+    proc = subprocess.Popen([
         sys.executable, "app.py",
-        "--input", "file://sample_video.mp4!loop",
+        "--input", f"file://{sample_video}!loop",
         "--fps", "10",
         "--detection-threshold", "0.3",
-        "--max-detections", "5"
-    ], capture_output=True, text=True, timeout=30, cwd=test_dir)
+        "--max-detections", "5",
+        "--base-port", str(base_port),
+        "--webvis-port", str(webvis_port),
+    ], env=env, cwd=test_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+       start_new_session=True)
+
+    tail = deque(maxlen=200)
+    seen = threading.Event()
+    done = threading.Event()
+
+    def pump():
+        for line in proc.stdout:
+            tail.append(line)
+            if until in line:
+                seen.set()
+                done.set()
+        done.set()  # EOF, the app and all its filters exited
+
+    pumper = threading.Thread(target=pump, daemon=True)
+    pumper.start()
+
+    try:
+        done.wait(timeout)
+    finally:
+        if proc.poll() is None:
+            os.killpg(proc.pid, signal.SIGINT)
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pass
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)  # anything left over
+        except ProcessLookupError:
+            pass
+        proc.wait()
+        pumper.join(timeout=5)
+
+    if seen.is_set():
+        return True, "".join(tail)
+    reason = f"exited with {proc.returncode}" if done.is_set() else f"no {until!r} within {timeout} seconds"
+    return False, f"{reason}\n{''.join(tail)}"
+
+def test_basic_run(sample_video):
+    """Test basic run without observability."""
+    print("🧪 Testing basic run (no observability)...")
+
+    ok, output = run_app(sample_video, 6000, 8000)
 
-    assert result.returncode == 0, f"Basic run failed: {result.stderr}"
+    assert ok, f"Basic run failed: {output}"
     print("✅ Basic run successful")
 
-def test_telemetry_enabled():
+def test_telemetry_enabled(sample_video):
     """Test with OpenTelemetry enabled."""
     print("🧪 Testing with OpenTelemetry enabled...")
 
-    # Get the directory where this test file is located
-    test_dir = Path(__file__).parent
-
     env = os.environ.copy()
     env["TELEMETRY_EXPORTER_ENABLED"] = "true"
     env["TELEMETRY_EXPORTER_TYPE"] = "console"
 
-    result = subprocess.run([
-        sys.executable, "app.py",
-        "--input", "file://sample_video.mp4!loop",
-        "--fps", "10",
-        "--detection-threshold", "0.3",
-        "--max-detections", "5"
-    ], env=env, capture_output=True, text=True, timeout=30, cwd=test_dir)
+    ok, output = run_app(sample_video, 6010, 8010, env)
 
-    assert result.returncode == 0, f"Telemetry run failed: {result.stderr}"
+    assert ok, f"Telemetry run failed: {output}"
     print("✅ Telemetry run successful")
 
     # Check for telemetry output - just verify the app ran without asserting specific text
     # since telemetry output format may vary
     print("✅ Telemetry run completed successfully")
 
-def test_openlineage_enabled():
+def test_openlineage_enabled(sample_video):
     """Test with OpenLineage enabled."""
     print("🧪 Testing with OpenLineage enabled...")
 
-    # Get the directory where this test file is located
-    test_dir = Path(__file__).parent
-
     env = os.environ.copy()
     env["TELEMETRY_EXPORTER_ENABLED"] = "true"
     env["OPENLINEAGE_URL"] = "https://oleander.dev"
     env["OPENLINEAGE_API_KEY"] = "test_key"
     env["OF_SAFE_METRICS"] = "frames_processed,frames_with_detections,detections_per_frame_histogram,detection_confidence_histogram"
 
-    result = subprocess.run([
-        sys.executable, "app.py",
-        "--input", "file://sample_video.mp4!loop",
-        "--fps", "10",
-        "--detection-threshold", "0.3",
-        "--max-detections", "5"
-    ], env=env, capture_output=True, text=True, timeout=30, cwd=test_dir)
+    ok, output = run_app(sample_video, 6020, 8020, env)
 
-    assert result.returncode == 0, f"OpenLineage run failed: {result.stderr}"
+    assert ok, f"OpenLineage run failed: {output}"
     print("✅ OpenLineage run successful")
 
     # Check for OpenLineage output - just verify the app ran without asserting specific text
@@ -107,6 +148,97 @@ def check_output_files():
         print("❌ Processed video not found")
         return False
 
+def sample_video_signature(test_dir):
+    """Hash of the sample video and of the script that made it, a missing, partial or stale video doesn't match the
+    one recorded after it was created."""
+    return " ".join(hashlib.sha256((test_dir / name).read_bytes()).hexdigest()
+                    for name in ("sample_video.mp4", "create_sample_video.py"))
+
+def sample_video_cache_path(test_dir):
+    """Where a video made by this version of create_sample_video.py is kept for other checkouts and clean runs, under
+    the user cache directory and named by the generator's hash."""
+    digest = hashlib.sha256((test_dir / "create_sample_video.py").read_bytes()).hexdigest()[:16]
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "openfilter-demo"
+    return cache_dir / f"sample_video_{digest}.mp4"
+
+def link_or_copy(src, dst):
+    """Put `src` at `dst`, hard linked if possible else copied, replacing `dst` in one step so it is never partial."""
+    try:
+        if os.path.samefile(src, dst):
+            return  # already linked, and renaming a link over another of the same file would be a no-op
+    except OSError:
+        pass
+
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+def ensure_sample_video(test_dir):
+    """Create the sample video unless the one there was completely created by the current create_sample_video.py,
+    taking it from the user cache if that has one. Returns its path. Safe to call from several processes at once (e.g.
+    pytest-xdist workers), the first one creates it while the others wait then reuse it."""
+    sample_video = test_dir / "sample_video.mp4"
+    sidecar = test_dir / ".sample_video.sha256"
+
+    with open(test_dir / ".sample_video.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        try:
+            if sidecar.read_text() == sample_video_signature(test_dir):
+                return sample_video
+        except OSError:
+            pass
+
+        sidecar.unlink(missing_ok=True)
+        cached = sample_video_cache_path(test_dir)
+
+        if cached.is_file():
+            print(f"📹 Using cached sample video {cached}")
+            link_or_copy(cached, sample_video)
+        else:
+            print("📹 Creating sample video...")
+            # Likely a hard link to the cache entry of an older generator, which VideoWriter would truncate and rewrite
+            sample_video.unlink(missing_ok=True)
+            subprocess.run([sys.executable, "create_sample_video.py"], check=True, cwd=test_dir)
+            try:
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                link_or_copy(sample_video, cached)
+            except OSError as e:
+                print(f"⚠️  Could not cache the sample video: {e}")  # only a cache, carry on
+
+        sidecar.write_text(sample_video_signature(test_dir))
+
+    return sample_video
+
+class ThreadStdout:
+    """Stand-in for sys.stdout which keeps what each capturing thread prints separately, so the output of tests run at
+    the same time can be shown one test after the other instead of interleaved."""
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.local = threading.local()
+
+    def write(self, text):
+        return (getattr(self.local, "buf", None) or self.stdout).write(text)
+
+    def flush(self):
+        self.stdout.flush()
+
+    def run(self, func, *args):
+        """Call func(*args) capturing what it prints, returns (printed text, exception or None)."""
+        self.local.buf = buf = io.StringIO()
+        try:
+            func(*args)
+            return buf.getvalue(), None
+        except Exception as e:
+            return buf.getvalue(), e
+        finally:
+            self.local.buf = None
+
 def main():
     """Run all tests."""
     print("🚀 Starting Observability Demo Tests")
@@ -115,29 +247,43 @@ def main():
     # Get the directory where this test file is located
     test_dir = Path(__file__).parent
 
-    # Check if sample video exists
-    sample_video = test_dir / "sample_video.mp4"
-    if not sample_video.exists():
-        print("📹 Creating sample video...")
-        subprocess.run([sys.executable, "create_sample_video.py"], check=True, cwd=test_dir)
+    sample_video = ensure_sample_video(test_dir)
 
-    tests = [
+    # The pipeline runs are each mostly waiting on their app subprocess and use their own ports, so they run at the
+    # same time, the output files check needs them done
+    pipeline_tests = [
         ("Basic Run", test_basic_run),
         ("Telemetry Enabled", test_telemetry_enabled),
         ("OpenLineage Enabled", test_openlineage_enabled),
-        ("Output Files", check_output_files)
     ]
+    tests = pipeline_tests + [("Output Files", check_output_files)]
 
     passed = 0
     total = len(tests)
 
+    stdout = sys.stdout = ThreadStdout(sys.stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=len(pipeline_tests)) as executor:
+            futures = {test_name: executor.submit(stdout.run, test_func, sample_video)
+                       for test_name, test_func in pipeline_tests}
+    finally:
+        sys.stdout = stdout.stdout
+
     for test_name, test_func in tests:
         print(f"\n{test_name}:")
-        try:
-            test_func()
+        if test_name in futures:
+            output, error = futures[test_name].result()
+            print(output, end="")
+        else:
+            error = None
+            try:
+                test_func()
+            except Exception as e:
+                error = e
+        if error is None:
             passed += 1
-        except (AssertionError, subprocess.TimeoutExpired, Exception) as e:
-            print(f"❌ Test failed: {e}")
+        else:
+            print(f"❌ Test failed: {error}")
         print()
 
     print("=" * 50)
@@ -106,7 +106,7 @@ All demos follow this pattern:
 ## Video Sources
 
 - Multi/Crops demos: `../observability-demo/sample_video.mp4`
-- Single demo: `../openfilter-heroku-demo/assets/sample-video.mp4`
+- Single demo: `../openfilter-heroku-demo/assets/sample-video.mp4` (or `VIDEO_INPUT`)
 
 Both sources use `!loop` to continuously repeat the video.
 
@@ -273,7 +273,7 @@ All demos preserve original frame data and augment it:
 2. **Generated Metadata**: Text regions, bounding boxes, confidence scores
 3. **Crop-Specific Data**: Dimensions, region IDs, cropped coordinates
 
-The `Frame.data.update()` call merges original data with new text-specific metadata, ensuring downstream filters receive complete context about both the video source and generated text content.
+Each output frame's data is the original data merged with new text-specific metadata (`{**frame.data, ...}`), ensuring downstream filters receive complete context about both the video source and generated text content.
 
 ## Image Formats and Dimensions
 
@@ -284,6 +284,7 @@ The `Frame.data.update()` call merges original data with new text-specific metad
 - **Text Rendering**: OpenCV putText with FONT_HERSHEY_SIMPLEX
 """
 
+import os
 from openfilter.filter_runtime.filter import Filter
 from text_generator_filter import TextGeneratorFilter, SingleTextGeneratorFilter, TextGeneratorConfig, SingleTextGeneratorConfig
 from openfilter.filter_runtime.filters.video_in import VideoIn
@@ -377,7 +378,7 @@ def run_single_text_demo():
     
     Filter.run_multi([
         (VideoIn, dict(
-            sources='file:///Users/navarmn/dev/plainsight/openfilter/examples/openfilter-heroku-demo/assets/sample-video.mp4!loop',
+            sources=f"file://{os.getenv('VIDEO_INPUT', '../openfilter-heroku-demo/assets/sample-video.mp4')}!loop",
             outputs='tcp://*:5550',
         )),
         (SingleTextGeneratorFilter, config),
@@ -43,6 +43,8 @@ python main.py single
 - `output_main: bool` - Whether to output the main frame with all texts
 - `output_crops: bool` - Whether to output individual text crops
 - `crop_topic_prefix: str` - Prefix for crop topic names (e.g., 'crop_')
+- `enabled_crop_topics: list | str` - Only output these crop topics (list or comma separated), e.g. the ones
+  downstream actually subscribes to, default all
 - `frame_width/height: int` - Dimensions of generated frames
 - `texts: list` - List of text configurations with:
   - `text: str` - Text content to render
@@ -84,6 +86,7 @@ class TextGeneratorConfig(FilterConfig):
     frame_width: int = 800
     frame_height: int = 600
     texts: list = None
+    enabled_crop_topics: list[str] | str | None = None
     mq_log: str | bool | None = None
 
 
@@ -107,13 +110,21 @@ class TextGeneratorFilter(Filter):
                 {"text": "OCR Test", "x": 500, "y": 350, "font_scale": 1.0, "color": (0, 255, 255)}
             ]
         
+        if isinstance(config.enabled_crop_topics, str):
+            config.enabled_crop_topics = [t.strip() for t in config.enabled_crop_topics.split(',') if t.strip()]
+        
         # Frame counter for unique identification
         self.frame_counter = 0
         
+        # The texts never change after setup, render them once
+        self._build_template()
+        
         print(f"[TextGeneratorFilter] Setup complete with config: {config}")
     
-    def create_text_frame(self):
-        """Create a black frame with text at specified coordinates."""
+    def _build_template(self):
+        """Render the black frame with all the texts and their regions once, into `self._template_frame` and
+        `self._text_regions`. The frame is made readonly so it can be sent as is every time, a downstream filter that
+        wants to draw on it gets its own copy through `frame.rw`."""
         # Create black frame
         frame = np.zeros((self.config.frame_height, self.config.frame_width, 3), dtype=np.uint8)
         
@@ -151,20 +162,35 @@ class TextGeneratorFilter(Filter):
                 "confidence": 1.0  # Perfect text since we generated it
             })
         
-        return frame, text_regions
-    
-    def crop_text_regions(self, frame, text_regions):
-        """Crop individual text regions from the main frame."""
-        crops = {}
+        frame.flags.writeable = False
+        
+        self._template_frame = frame
+        self._text_regions = text_regions
         
-        for region in text_regions:
-            bbox = region["bbox"]
-            x1, y1, x2, y2 = bbox
+        # Main frame data, all but the frame_id
+        self._main_data_static = {
+            "text_regions": text_regions,
+            "frame_width": self.config.frame_width,
+            "frame_height": self.config.frame_height,
+            "total_texts": len(text_regions)
+        }
+        
+        # Each region's crop and the data sent with it, only the source frame's data changes per frame. The crops are
+        # copied out once here, a slice of the template is not contiguous and can't be sent as a raw image. Crops whose
+        # topic is not in enabled_crop_topics are left out entirely.
+        self._crops = []
+        enabled = self.config.enabled_crop_topics
+        topic_names = [f"{self.config.crop_topic_prefix}{region['region_id']}" for region in text_regions]
+        
+        if enabled is not None and (unknown := set(enabled) - set(topic_names)):
+            raise ValueError(f"unknown enabled_crop_topics {sorted(unknown)}, crop topics are {topic_names}")
+        
+        for region, topic_name in zip(text_regions, topic_names):
+            if enabled is not None and topic_name not in enabled:
+                continue
             
-            # Crop the region
-            crop = frame[y1:y2, x1:x2]
+            x1, y1, x2, y2 = bbox = region["bbox"]
             
-            # Create crop data
             crop_data = {
                 "text": region["text"],
                 "bbox": bbox,
@@ -174,14 +200,14 @@ class TextGeneratorFilter(Filter):
                 "crop_height": y2 - y1
             }
             
-            # Store crop with dynamic topic name
-            topic_name = f"{self.config.crop_topic_prefix}{region['region_id']}"
-            crops[topic_name] = {
-                "image": crop,
-                "data": crop_data
-            }
-        
-        return crops
+            crop = frame[y1:y2, x1:x2].copy()
+            crop.flags.writeable = False
+            self._crops.append((topic_name, crop, crop_data))
+    
+    def create_text_frame(self):
+        """Return the black frame with text at specified coordinates (readonly, rendered in setup) and its text
+        regions."""
+        return self._template_frame, self._text_regions
     
     def process(self, frames: Dict[str, Frame]) -> Dict[str, Frame]:
         """Process frames and generate text frames with optional crops."""
@@ -189,34 +215,24 @@ class TextGeneratorFilter(Filter):
         
         for frame_id, frame in frames.items():
             # Generate new frame with text
-            text_frame, text_regions = self.create_text_frame()
-            
-            # Create frame data
-            frame_data = {
-                "text_regions": text_regions,
-                "frame_width": self.config.frame_width,
-                "frame_height": self.config.frame_height,
-                "frame_id": self.frame_counter,
-                "total_texts": len(text_regions)
-            }
+            text_frame, _ = self.create_text_frame()
             
             # Add main frame if configured
             if self.config.output_main:
-                # Update the existing frame with new image and data    
+                # New image, the existing frame's data updated with the main frame data
                 processed_frames[frame_id] = Frame(
                         text_frame,
-                        frame.data.update(frame_data),
+                        {**frame.data, **self._main_data_static, "frame_id": self.frame_counter},
                         "BGR"
                     )
             
-            # Add individual crops if configured
+            # Add individual crops if configured, readonly and cut from the template in setup
             if self.config.output_crops:
-                crops = self.crop_text_regions(text_frame, text_regions)
-                for topic_name, crop_info in crops.items():
+                for topic_name, crop, crop_data in self._crops:
                     # Create new frame for each crop
                     processed_frames[topic_name] = Frame(
-                        crop_info["image"],
-                        {**frame.data, **crop_info["data"]},
+                        crop,
+                        {**frame.data, **crop_data},
                         "BGR"
                     )
             
@@ -252,10 +268,14 @@ class SingleTextGeneratorFilter(Filter):
         # Frame counter for unique identification
         self.frame_counter = 0
         
+        # The text never changes after setup, render and crop it once
+        self._build_template()
+        
         print(f"[SingleTextGeneratorFilter] Setup complete with config: {config}")
     
-    def create_single_text_frame(self):
-        """Create a black frame with a single text."""
+    def _build_template(self):
+        """Render the single text on a black frame and crop it once, into `self._crop` (readonly, like
+        TextGeneratorFilter's template) and `self._crop_data_template`, everything but the frame_id."""
         # Create black frame
         frame = np.zeros((self.config.frame_height, self.config.frame_width, 3), dtype=np.uint8)
         
@@ -276,31 +296,33 @@ class SingleTextGeneratorFilter(Filter):
             min(self.config.frame_height, self.config.y + baseline + 10)
         ]
         
-        # Crop the text region
+        # Crop the text region, its own contiguous copy so the full frame is not kept around
         x1, y1, x2, y2 = bbox
-        crop = frame[y1:y2, x1:x2]
+        crop = frame[y1:y2, x1:x2].copy()
+        crop.flags.writeable = False
         
-        return crop, {
+        self._crop = crop
+        self._crop_data_template = {
             "text": self.config.text,
             "bbox": bbox,
             "confidence": 1.0,
             "crop_width": x2 - x1,
-            "crop_height": y2 - y1,
-            "frame_id": self.frame_counter
+            "crop_height": y2 - y1
         }
     
+    def create_single_text_frame(self):
+        """Return the single text crop (readonly, rendered in setup) and its data."""
+        return self._crop, {**self._crop_data_template, "frame_id": self.frame_counter}
+    
     def process(self, frames: Dict[str, Frame]) -> Dict[str, Frame]:
         """Process frames and generate single text crops."""
         processed_frames = {}
         
         for frame_id, frame in frames.items():
-            # Generate crop with single text
-            text_crop, crop_data = self.create_single_text_frame()
-            
-            # Output only the crop, not the main frame
+            # Output only the crop (rendered in setup), not the main frame
             processed_frames[self.config.crop_topic] = Frame(
-                text_crop,
-                {**frame.data, **crop_data},
+                self._crop,
+                {**frame.data, **self._crop_data_template, "frame_id": self.frame_counter},
                 "BGR"
             )
             
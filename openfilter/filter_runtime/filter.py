@@ -22,6 +22,7 @@ from typing_extensions import deprecated
 from .dlcache import is_cached_file, dlcache
 from .frame import Frame
 from .mq import POLL_TIMEOUT_MS, is_mq_addr, MQ
+from .zeromq import ZMQContext
 from .logging import Logger
 from .utils import (
     JSONType,
@@ -455,7 +456,7 @@ class Filter:
             Unique string identifier for this filter. If this is not provided then it will be randomly generated.
 
         sources:
-            Sources for this filter, they can be either other filters ('tcp://', 'ipc://') or filter specific URIs like
+            Sources for this filter, they can be either other filters ('tcp://', 'ipc://', 'inproc://') or filter specific URIs like
             'file://', 'rtsp://', 'http://', etc... When thet are other filters they are handled here and take the
             following form (there can be multiple delimited by commas, whitespace is ignored):
 
@@ -485,6 +486,7 @@ class Filter:
 
         outputs:
             Where other filters will connect to get their data, e.g. "tcp://127.0.0.1", "tcp://*:5552", "ipc://name".
+            "inproc://name" only works between filters running in the same process via `Filter.run_multi_inproc()`.
             NOT the destination filters themselves! Repeat, this is a bind point where this filter will listen for
             connections, not where it should connect to send data. This field is also commonly overloaded by specific
             output filters like video or messaging queue outputs.
@@ -1249,9 +1251,10 @@ class Filter:
                     for key in keys_to_remove:
                         del self.emitter._last_frame_data[key]
 
-        for frame in frames.values():
-            if hasattr(frame, "data") and isinstance(frame.data, dict):
-                self._telemetry.record(frame.data)
+        self._telemetry.record_batch([
+            frame.data for frame in frames.values()
+            if hasattr(frame, "data") and isinstance(frame.data, dict)
+        ])
 
     def get_normalized_setup_metrics(self, prefix: str = "dim_") -> dict[str, Any]:
 
@@ -2053,13 +2056,13 @@ class Filter:
             is_mq_addr(bad_src := source) for source in sources
         ):
             raise ValueError(
-                f"invalid source {bad_src!r}, only tcp:// or ipc:// sources allowed"
+                f"invalid source {bad_src!r}, only tcp://, ipc:// or inproc:// sources allowed"
             )
         if (outputs := config.outputs) and not all(
             is_mq_addr(bad_out := output) for output in outputs
         ):
             raise ValueError(
-                f"invalid output {bad_out!r}, only tcp:// or ipc:// outputs allowed"
+                f"invalid output {bad_out!r}, only tcp://, ipc:// or inproc:// outputs allowed"
             )
 
         self.logger.set_fixed_metrics(
@@ -2086,6 +2089,9 @@ class Filter:
                     filter_id=self._filter_id,
                     setup_metrics=self.setup_metrics,
                     lineage_emitter=self.emitter,
+                    exp_histogram_names=[
+                        spec.name for spec in self.metric_specs if spec.instrument == "exp_histogram"
+                    ],
                 )
 
                 # Initialize telemetry registry if metric specs are declared
@@ -2768,6 +2774,87 @@ class Filter:
 
         return retcodes
 
+    @staticmethod
+    def run_multi_inproc(
+        filters: list[tuple["Filter", dict[str, Any]]],
+        *,
+        loop_exc: bool | None = None,
+        prop_exit: str | None = None,
+        obey_exit: str | None = None,
+        stop_evt: threading.Event | None = None,
+        sig_stop: bool = True,
+        step_wait: float = 0.05,
+    ) -> list[int]:
+        """Run multiple filters as threads of this process instead of in their own processes. Filters connected with
+        'inproc://' addresses pass frames through the one shared ZeroMQ context in memory, no process spawn and no trip
+        through the network stack. All filters are stopped as soon as any one of them exits. See Runner for args.
+
+        Notes:
+            * All filters share one interpreter (GIL, environment, signal handlers), so this is meant for demos, tests
+            and light pipelines, use run_multi() to spread heavy filters across cores.
+            * '__env_run' is ignored since there is only one environment to set.
+
+        Returns:
+            A list of exit codes in the same order as `filters`, 0 means clean exit, 1 means the filter raised.
+        """
+
+        if not filters:
+            raise ValueError("must specify at least one Filter to run")
+
+        if sig_stop:
+            stop_evt = SignalStopper(logger, stop_evt).stop_evt
+        elif stop_evt is None:
+            stop_evt = threading.Event()
+
+        device_name = os.uname().nodename
+        pipeline_id = f"{device_name}-{uuid4()}"
+        filter_stops = [threading.Event() for _ in filters]
+        retcodes = [0] * len(filters)
+
+        def run(idx: int, filter_cls: type["Filter"], config: dict[str, Any]):
+            try:
+                filter_cls.run(
+                    config,
+                    loop_exc=loop_exc,
+                    prop_exit=prop_exit,
+                    obey_exit=obey_exit,
+                    stop_evt=filter_stops[idx],
+                    sig_stop=False,
+                )
+            except BaseException:  # already logged by Filter.run()
+                retcodes[idx] = 1
+
+        threads = [
+            threading.Thread(
+                target=run,
+                args=(idx, filter_cls, {**dict_without(config, "__env_run"), "pipeline_id": pipeline_id,
+                    "device_name": device_name}),
+                daemon=True,
+            )
+            for idx, (filter_cls, config) in enumerate(filters)
+        ]
+
+        ZMQContext.get()  # hold the context open so all threads bind and connect their 'inproc://' in the same one
+
+        try:
+            for thread in threads:
+                thread.start()
+
+            while not stop_evt.wait(step_wait) and not any(evt.is_set() for evt in filter_stops):
+                pass
+
+        finally:
+            for evt in filter_stops:
+                evt.set()
+
+            for thread in threads:
+                thread.join()
+
+            ZMQContext.free()
+            stop_evt.set()
+
+        return retcodes
+
     class Runner:
         def __init__(
             self,
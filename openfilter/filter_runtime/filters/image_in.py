@@ -1,10 +1,11 @@
 import logging
 import os
 import re
-import glob
-from threading import Thread, Event
-from time import time, time_ns, sleep
-from typing import Any, List, Optional
+import fnmatch
+from functools import lru_cache
+from threading import Thread, Event, Lock
+from time import monotonic, time, time_ns, sleep
+from typing import Any, Callable, Iterator, List, Optional
 from urllib.parse import urlparse
 
 import cv2
@@ -23,6 +24,7 @@ try:
 except ImportError:
     HAS_GCS = False
 
+from openfilter.filter_runtime import inotify
 from openfilter.filter_runtime.filter import Filter, Frame, FilterConfig
 from openfilter.filter_runtime.utils import json_getval, split_commas_maybe, dict_without, adict
 
@@ -32,8 +34,11 @@ logger = logging.getLogger(__name__)
 
 # Environment variable defaults (following VideoIn pattern)
 IMAGE_IN_POLL_INTERVAL = float(json_getval((os.getenv('IMAGE_IN_POLL_INTERVAL') or os.getenv('FILTER_POLL_INTERVAL') or '5.0')))
+IMAGE_IN_POLL_INTERVAL_MAX = None if (_ := json_getval((os.getenv('IMAGE_IN_POLL_INTERVAL_MAX') or os.getenv('FILTER_POLL_INTERVAL_MAX') or 'null').lower())) is None else float(_)
 IMAGE_IN_LOOP = json_getval((os.getenv('IMAGE_IN_LOOP') or os.getenv('FILTER_LOOP') or 'false').lower())
 IMAGE_IN_RECURSIVE = bool(json_getval((os.getenv('IMAGE_IN_RECURSIVE') or os.getenv('FILTER_RECURSIVE') or 'false').lower()))
+IMAGE_IN_WATCH = (os.getenv('IMAGE_IN_WATCH') or os.getenv('FILTER_WATCH') or 'poll').lower()
+IMAGE_IN_DECODE_CACHE = float(json_getval((os.getenv('IMAGE_IN_DECODE_CACHE') or os.getenv('FILTER_DECODE_CACHE') or '0')))
 IMAGE_IN_MAXFPS = None if (_ := json_getval((os.getenv('IMAGE_IN_MAXFPS') or os.getenv('FILTER_MAXFPS') or 'null').lower())) is None else float(_)
 
 # Image file extensions
@@ -41,24 +46,32 @@ IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'bmp', 'tif', 'tiff', 'gif', 'webp'}
 
 def is_image_file(path: str) -> bool:
     """Check if file is an image based on extension."""
-    ext = path.lower().rsplit(".", 1)[-1]
-    return ext in IMAGE_EXTENSIONS
+    return path.rpartition(".")[2].lower() in IMAGE_EXTENSIONS
 
-def matches_pattern(path: str, pattern: str) -> bool:
-    """Check if path matches the given pattern (glob or regex)."""
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str | None) -> Callable[[str], bool]:
+    """Compile a glob or regex pattern once into a function which checks whether a path matches it. Same rules as
+    `matches_pattern()`, for use in loops over many paths."""
     if not pattern:
-        return True
-    
-    # Try as glob pattern first
+        return lambda path: True
+
+    # Try as glob pattern first, matched against the file name
     if '*' in pattern or '?' in pattern:
-        return glob.fnmatch.fnmatch(os.path.basename(path), pattern)
-    
+        match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+        return lambda path: match(os.path.normcase(os.path.basename(path))) is not None
+
     # Try as regex pattern
     try:
-        return bool(re.search(pattern, path))
+        search = re.compile(pattern).search
     except re.error:
         # If regex is invalid, treat as literal string
-        return pattern in path
+        return lambda path: pattern in path
+
+    return lambda path: search(path) is not None
+
+def matches_pattern(path: str, pattern: str) -> bool:
+    """Check if path matches the given pattern (glob or regex)."""
+    return compile_pattern(pattern)(path)
 
 def parse_s3_uri(s3_uri: str):
     """Parse S3 URI into bucket and key components."""
@@ -117,6 +130,9 @@ class ImageInConfig(FilterConfig):
     recursive: bool | None
     pattern: str | None
     poll_interval: float | None
+    poll_interval_max: float | None
+    watch: str | None
+    decode_cache: float | None
     maxfps: float | None
     
 
@@ -176,6 +192,31 @@ class ImageIn(Filter):
         poll_interval:
             Seconds between directory/bucket scans when idle. Set here to apply to all sources or can be set
             individually per source. Global env var default FILTER_POLL_INTERVAL / IMAGE_IN_POLL_INTERVAL.
+
+        poll_interval_max:
+            If greater than `poll_interval` then the wait between scans doubles after each scan which found nothing new,
+            changed or deleted, up to this many seconds, and drops back to `poll_interval` as soon as a scan finds
+            something. Cuts down on pointless scans of directories / buckets which are idle for long stretches at the
+            cost of noticing the first new image after a lull up to this late. Default is no backoff. Global env var
+            default FILTER_POLL_INTERVAL_MAX / IMAGE_IN_POLL_INTERVAL_MAX.
+
+        watch:
+            How file:// directory sources notice new files. 'poll' (default) rescans every `poll_interval`. 'inotify'
+            (Linux only) has the kernel report files as they finish being written or are moved in, so new images are
+            picked up immediately and an idle directory costs nothing. Only the file named by each event is checked
+            against `pattern`, the directory is not rescanned. Recursive sources, cloud sources, platforms
+            without inotify and directories it can't watch keep polling. Use 'poll' for network mounts (NFS, CIFS)
+            written to from other machines, inotify does not see those changes. Global env var default
+            FILTER_WATCH / IMAGE_IN_WATCH.
+
+        decode_cache:
+            Megabytes of decoded local images to keep so that an image which is sent again unchanged (looping, or
+            re-queued) is not read and decoded again. Cached images are checked against the file's mtime and size
+            before each use, least recently used ones are dropped first. Only pays off for looping sources, a source
+            which sends each image once just holds the memory. While enabled every local image is sent readonly since
+            the same array goes out in every frame sent from it, downstream filters which draw on `frame.image` must
+            use `frame.rw` (or copy) first. 0 disables. Default 0. Global env var default FILTER_DECODE_CACHE /
+            IMAGE_IN_DECODE_CACHE.
         
         region:
             AWS region for S3 sources. Only applies to s3:// sources.
@@ -196,10 +237,13 @@ class ImageIn(Filter):
             openfilter run - ImageIn --sources file:///path/to/images!maxfps=1.0 - Webvis
 
     Environment variables (FILTER_* or legacy IMAGE_IN_* prefix, legacy takes precedence):
-        FILTER_LOOP           / IMAGE_IN_LOOP
-        FILTER_RECURSIVE      / IMAGE_IN_RECURSIVE
-        FILTER_POLL_INTERVAL  / IMAGE_IN_POLL_INTERVAL
-        FILTER_MAXFPS         / IMAGE_IN_MAXFPS
+        FILTER_LOOP              / IMAGE_IN_LOOP
+        FILTER_RECURSIVE         / IMAGE_IN_RECURSIVE
+        FILTER_POLL_INTERVAL     / IMAGE_IN_POLL_INTERVAL
+        FILTER_POLL_INTERVAL_MAX / IMAGE_IN_POLL_INTERVAL_MAX
+        FILTER_WATCH             / IMAGE_IN_WATCH
+        FILTER_DECODE_CACHE      / IMAGE_IN_DECODE_CACHE
+        FILTER_MAXFPS            / IMAGE_IN_MAXFPS
 
     S3 Configuration:
         For s3:// sources, AWS credentials are required. Set these environment variables:
@@ -251,6 +295,12 @@ class ImageIn(Filter):
         if len(set(source.topic for source in sources)) != len(sources):
             raise ValueError(f'duplicate image topics in {sources!r}')
 
+        if config.watch is not None:
+            if (watch := str(config.watch).lower()) not in ('poll', 'inotify'):
+                raise ValueError(f"invalid watch {config.watch!r}, must be 'poll' or 'inotify'")
+
+            config.watch = watch
+
         return config
 
     def init(self, config):
@@ -262,8 +312,16 @@ class ImageIn(Filter):
         self.frame_id = -1
         self.queues = {}                # topic -> list[path]
         self.processed = {}             # topic -> set[path]
+        self.seen = {}                  # topic -> {path: (st_ino, st_mtime_ns, st_size)}, local sources when polled
         self.loop_counts = {}           # topic -> int (remaining loops)
         self.stop_event = Event()
+
+        # Decoded local images, path -> ((st_mtime_ns, st_size), readonly image), least recently used first
+        self._decode_cache = {}
+        self._decode_cache_bytes = 0
+        self._decode_cache_max = int((IMAGE_IN_DECODE_CACHE if config.decode_cache is None else config.decode_cache)
+            * 1024 * 1024)
+        self._decode_cache_lock = Lock()  # the poll thread evicts deleted files
         
         # FPS control variables
         self.ns_per_maxfps = {}         # topic -> int (nanoseconds per maxfps)
@@ -275,6 +333,7 @@ class ImageIn(Filter):
             if topic not in self.queues:
                 self.queues[topic] = []
                 self.processed[topic] = set()
+                self.seen[topic] = {}
                 loop_val = source.options.loop if source.options.loop is not None else config.loop
                 if isinstance(loop_val, int) and loop_val is not True and loop_val is not False and loop_val > 0:
                     self.loop_counts[topic] = loop_val - 1   # finite: remaining reloads after initial pass
@@ -332,22 +391,44 @@ class ImageIn(Filter):
 
     def _list_local_images(self, path: str, options) -> List[str]:
         """List image files from local filesystem."""
+        return sorted(image_path for image_path, _ in self._iter_local_images(path, options))
+
+    def _stat_local_images(self, path: str, options) -> Iterator[tuple[str, os.stat_result]]:
+        """Image files from local filesystem with their stat, files which vanish while listing are left out."""
+        for image_path, entry in self._iter_local_images(path, options):
+            try:
+                yield image_path, (os.stat(image_path) if entry is None else entry.stat())
+            except OSError:
+                pass
+
+    def _iter_local_images(self, path: str, options) -> Iterator[tuple[str, os.DirEntry | None]]:
+        """Image files from local filesystem, unsorted, as (path, DirEntry) or (path, None) if `path` is a file."""
         if not os.path.exists(path):
             logger.warning(f"Path does not exist: {path}")
-            return []
+            return
 
-        images = []
+        matches = compile_pattern(options.pattern or self.config.pattern)
         if os.path.isfile(path):
-            if is_image_file(path) and matches_pattern(path, options.pattern or self.config.pattern):
-                images.append(path)
+            if is_image_file(path) and matches(path):
+                yield path, None
         else:
-            # Directory
-            pattern = os.path.join(path, '**' if (options.recursive or self.config.recursive) else '*')
-            for file_path in glob.glob(pattern, recursive=(options.recursive or self.config.recursive)):
-                if os.path.isfile(file_path) and is_image_file(file_path) and matches_pattern(file_path, options.pattern or self.config.pattern):
-                    images.append(file_path)
-
-        return sorted(images)
+            # Directory, scandir gets the file type from the directory listing itself so regular files need no stat(),
+            # and the name is checked before building a full path. Hidden entries are skipped like glob('*') does.
+            recursive = options.recursive or self.config.recursive
+            dirs = [path]
+            while dirs:
+                try:
+                    it = os.scandir(dirs.pop())
+                except OSError:
+                    continue
+                with it:
+                    for entry in it:
+                        if entry.name.startswith('.'):
+                            continue
+                        if recursive and entry.is_dir():
+                            dirs.append(entry.path)
+                        elif is_image_file(entry.name) and entry.is_file() and matches(entry.path):
+                            yield entry.path, entry
 
     def _list_s3_images(self, s3_uri: str, options) -> List[str]:
         """List image files from S3 bucket."""
@@ -360,13 +441,14 @@ class ImageIn(Filter):
             s3_client = boto3.client('s3', region_name=options.region)
 
             images = []
+            matches = compile_pattern(options.pattern or self.config.pattern)
             paginator = s3_client.get_paginator('list_objects_v2')
 
             for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
                 if 'Contents' in page:
                     for obj in page['Contents']:
                         key = obj['Key']
-                        if is_image_file(key) and matches_pattern(key, options.pattern or self.config.pattern):
+                        if is_image_file(key) and matches(key):
                             images.append(f"s3://{bucket}/{key}")
 
             return sorted(images)
@@ -388,12 +470,13 @@ class ImageIn(Filter):
             client = storage.Client()
             bucket = client.bucket(bucket)
             
-            images = []
-            for blob in bucket.list_blobs(prefix=prefix):
-                if is_image_file(blob.name) and matches_pattern(blob.name, options.pattern or self.config.pattern):
-                    images.append(f"gs://{bucket.name}/{blob.name}")
-                            
-            return sorted(images)
+            matches = compile_pattern(options.pattern or self.config.pattern)
+            uri_prefix = f"gs://{bucket.name}/"
+            # Only the names are used, so only ask for those (a full blob resource is ~1 KB of JSON), in big pages
+            names = (blob.name for blob in
+                bucket.list_blobs(prefix=prefix, fields='items(name),nextPageToken', page_size=1000))
+
+            return sorted([uri_prefix + name for name in names if is_image_file(name) and matches(name)])
         except Exception as e:
             logger.error(f"Failed to list GCS images from {gs_uri}: {e}")
             return []
@@ -426,30 +509,237 @@ class ImageIn(Filter):
                 arr = np.frombuffer(data, np.uint8)
                 return cv2.imdecode(arr, cv2.IMREAD_COLOR)
             else:
-                return cv2.imread(path)
+                return self._load_local_image(path)
         except Exception as e:
             logger.error(f"Failed to load image {path}: {e}")
             return None
 
+    def _load_local_image(self, path: str) -> Optional[np.ndarray]:
+        """Load a local image, from the decode cache if the file has not changed since it was decoded (a stat instead of
+        a read and decode)."""
+        if not self._decode_cache_max:
+            return cv2.imread(path)
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._evict_decoded(path)
+
+            return None
+
+        key = (st.st_mtime_ns, st.st_size)
+
+        with self._decode_cache_lock:
+            if (cached := self._decode_cache.pop(path, None)) is not None:
+                if cached[0] == key:
+                    self._decode_cache[path] = cached  # most recently used now
+
+                    return cached[1]
+
+                self._decode_cache_bytes -= cached[1].nbytes
+
+        if (image := cv2.imread(path)) is None or image.nbytes > self._decode_cache_max:
+            return image
+
+        image.flags.writeable = False  # shared by every frame sent from it
+
+        with self._decode_cache_lock:
+            if (old := self._decode_cache.pop(path, None)) is not None:
+                self._decode_cache_bytes -= old[1].nbytes
+
+            self._decode_cache[path] = (key, image)
+            self._decode_cache_bytes += image.nbytes
+
+            while self._decode_cache_bytes > self._decode_cache_max:
+                self._decode_cache_bytes -= self._decode_cache.pop(next(iter(self._decode_cache)))[1].nbytes
+
+        return image
+
+    def _evict_decoded(self, path: str):
+        """Drop the cached decode of a local image which was deleted."""
+        with self._decode_cache_lock:
+            if (cached := self._decode_cache.pop(path, None)) is not None:
+                self._decode_cache_bytes -= cached[1].nbytes
+
+    def _scan_local_source(self, source, topic: str) -> bool:
+        """Queue the new and changed images of a local source. Files are told apart by (inode, mtime, size), so an
+        unchanged file costs a single stat per scan, while a file which was rewritten or replaced is sent again and one
+        which was deleted and comes back counts as new. Returns whether any image was queued or deleted."""
+        seen      = self.seen[topic]
+        processed = self.processed[topic]
+        queue     = self.queues[topic]
+        queued    = set(queue)
+        current   = set()
+        new       = []
+
+        for path, st in self._stat_local_images(source.source[7:], source.options):
+            current.add(path)
+
+            if (old := seen.get(path)) == (key := (st.st_ino, st.st_mtime_ns, st.st_size)):
+                continue
+
+            seen[path] = key
+
+            if (old is not None or path not in processed) and path not in queued:
+                new.append(path)
+
+        queue.extend(sorted(new))  # scandir order is arbitrary, queue by name like _list_images() does
+
+        changed = bool(new)
+
+        for path in seen.keys() - current:
+            del seen[path]
+            processed.discard(path)
+            self._evict_decoded(path)
+
+            changed = True
+
+        return changed
+
+    def _scan_sources(self, sources) -> bool:
+        """List the given sources and queue any images not seen before. Returns whether anything changed, errors count
+        as a change so they don't back the polling off."""
+        changed = False
+
+        try:
+            for source in sources:
+                topic = source.topic or 'main'
+                if source.source.startswith('file://'):
+                    changed |= self._scan_local_source(source, topic)
+                    continue
+                new_images = self._list_images(source)
+                queued     = set(self.queues[topic])
+                # Add only new images that haven't been processed or queued already
+                for img_path in new_images:
+                    if img_path not in self.processed[topic] and img_path not in queued:
+                        self.queues[topic].append(img_path)
+
+                        changed = True
+
+        except Exception as e:
+            logger.error(f"Error in polling loop: {e}")
+
+            return True
+
+        return changed
+
+    def _handle_watch_events(self, events, watched):
+        """Apply inotify events to the queues of the watched sources. Each event names the one file it is about, so only
+        that file is checked against the source's pattern, nothing is listed or stat'ed."""
+        queued = {}  # topic -> set of queued paths, built once per batch of events
+
+        for wd, mask, name in events:
+            if (source := watched.get(wd)) is None or not name:  # IN_IGNORED of a removed watch, or not about a file
+                continue
+
+            path = os.path.join(source.source[7:], name)
+
+            if not is_image_file(name) or not compile_pattern(source.options.pattern or self.config.pattern)(path):
+                continue  # the excluded images and temporary files of whoever is writing here
+
+            topic = source.topic or 'main'
+
+            queue = self.queues[topic]
+
+            if (topic_queued := queued.get(topic)) is None:
+                topic_queued = queued[topic] = set(queue)
+
+            self.seen[topic].pop(path, None)  # an event is newer than what the last scan saw
+
+            if mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):  # deleted or moved out, gone either way
+                self.processed[topic].discard(path)  # so the same name written again counts as a new image
+                self._evict_decoded(path)
+
+                if path in topic_queued:
+                    topic_queued.discard(path)
+
+                    try:  # in place, process() may be popping from the front of this queue at the same time
+                        queue.remove(path)
+                    except ValueError:
+                        pass
+
+            elif path not in topic_queued:  # written or moved in, new or changed content either way
+                topic_queued.add(path)
+                queue.append(path)
+
+    def _start_watcher(self):
+        """Set up inotify watches for the local directory sources that can use them if `watch` is 'inotify'. Returns
+        (watcher, {wd: source}), watcher is None if nothing is watched."""
+        if (self.config.watch or IMAGE_IN_WATCH) != 'inotify':
+            return None, {}
+
+        if not inotify.available():
+            logger.warning("ImageIn watch='inotify' is not available on this platform, polling instead")
+            return None, {}
+
+        watcher = inotify.Inotify()
+        watched = {}
+
+        for source in self.config.sources:
+            if not source.source.startswith('file://') or (source.options.recursive or self.config.recursive):
+                continue
+
+            path = source.source[7:]
+
+            if not os.path.isdir(path):
+                continue
+
+            try:  # only finished writes, moves in / out and deletes, opens / reads / attribute changes never wake us
+                wd = watcher.add_watch(path, inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_MOVED_FROM |
+                    inotify.IN_DELETE | inotify.IN_ONLYDIR)
+            except OSError as e:
+                logger.warning(f"Can not watch {path}, polling it instead: {e}")
+                continue
+
+            watched[wd] = source
+            logger.info(f"ImageIn watching {path} for new images")
+
+        if not watched:
+            watcher.close()
+
+            return None, {}
+
+        return watcher, watched
+
     def _poll_loop(self):
-        """Background thread that polls for new images."""
-        poll_interval = self.config.poll_interval or IMAGE_IN_POLL_INTERVAL
-        
-        while not self.stop_event.is_set():
-            try:
-                for source in self.config.sources:
-                    topic = source.topic or 'main'
-                    new_images = self._list_images(source)
-                    # Add only new images that haven't been processed
-                    for img_path in new_images:
-                        if img_path not in self.processed[topic]:
-                            self.queues[topic].append(img_path)
+        """Background thread that polls for new images, or waits for inotify events on the sources being watched. The
+        wait between polls backs off towards `poll_interval_max` while scans keep finding nothing."""
+        poll_interval     = self.config.poll_interval or IMAGE_IN_POLL_INTERVAL
+        poll_interval_max = max(poll_interval, self.config.poll_interval_max or IMAGE_IN_POLL_INTERVAL_MAX or 0)
+        interval          = poll_interval
+        watcher, watched = self._start_watcher()
+        polled = [source for source in self.config.sources if all(source is not s for s in watched.values())]
+        sources = self.config.sources  # first scan covers everything, also what changed before the watches existed
 
-            except Exception as e:
-                logger.error(f"Error in polling loop: {e}")
+        try:
+            while not self.stop_event.is_set():
+                if self._scan_sources(sources):
+                    interval = poll_interval
+                else:
+                    interval = min(interval * 2, poll_interval_max)
+
+                sources = polled
+
+                if watcher is None:
+                    # Sleep for poll interval
+                    self.stop_event.wait(interval)
+
+                    continue
+
+                # Handle watch events until the unwatched sources are due for their next scan, waking up at least
+                # every half second to notice stop_event
+                deadline = monotonic() + interval
+
+                while not self.stop_event.is_set() and (remaining := deadline - monotonic()) > 0:
+                    if events := watcher.read(min(remaining, 0.5)):
+                        if any(mask & inotify.IN_Q_OVERFLOW for _, mask, _ in events):  # events were lost, rescan
+                            self._scan_sources(list(watched.values()))
+                        else:
+                            self._handle_watch_events(events, watched)
 
-            # Sleep for poll interval
-            self.stop_event.wait(poll_interval)
+        finally:
+            if watcher is not None:
+                watcher.close()
 
     def _wait_for_fps(self, topic: str) -> bool:
         """Wait for FPS timing if maxfps is set for this topic. Returns True if frame should be sent."""
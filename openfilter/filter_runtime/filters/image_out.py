@@ -1,8 +1,11 @@
 import logging
 import os
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from time import strftime
+from queue import Queue
+from threading import Thread
+from time import localtime, strftime, time
 from typing import Any, Literal
 
 import cv2
@@ -33,7 +36,9 @@ class ImageWriter:
         bgr: bool | None = None,
         format: str | None = None,
         quality: int | None = None,
-        compression: int | None = None
+        compression: int | None = None,
+        prefetch: int | None = None,
+        cpu: int | None = None,
     ):
         """Write images to files in various formats.
 
@@ -49,6 +54,12 @@ class ImageWriter:
             quality: JPEG quality (1-100). Only used for JPEG format. Default from env var.
             
             compression: PNG compression level (0-9). Only used for PNG format. Default from env var.
+
+            prefetch: If > 0 then encoding and writing happen on a background thread fed by a queue of this depth,
+                so the caller only blocks when the queue is full. None or 0 writes inline in `write()`.
+
+            cpu: If not None and `prefetch` > 0 then the background thread pins itself to this CPU (where the platform
+                supports thread affinity), otherwise it is ignored.
         """
         
         if not is_file(output):
@@ -76,60 +87,115 @@ class ImageWriter:
         elif self.format in ('tiff', 'tif'):
             self.format = 'tiff'
         
+        # Encoder extension and params resolved once here instead of per frame
+        self.ext    = f'.{self.format}'
+        self.params = ([cv2.IMWRITE_JPEG_QUALITY, self.quality] if self.format == 'jpg' else
+                       [cv2.IMWRITE_PNG_COMPRESSION, self.compression] if self.format == 'png' else
+                       [cv2.IMWRITE_WEBP_QUALITY, self.quality] if self.format == 'webp' else
+                       [])
+
+        self.encode_key  = (self.ext, tuple(self.params), self.is_bgr)  # writers with equal keys produce equal bytes
+        self.strftime_t  = None  # second for which strftime_s was formatted
+        self.strftime_s  = None
         self.frame_count = 0
+        self.prefetch    = prefetch or 0
+        self.cpu         = cpu
+        self.queue       = None
+        self.thread      = None
         
         logger.info(f'image writer: {self.output} ({self.format})')
 
     def start(self):  # idempotent and safe to call whenever
-        pass
+        if self.prefetch > 0 and self.thread is None:
+            self.queue  = Queue(self.prefetch)
+            self.thread = Thread(target=self.thread_writer, daemon=True)
+
+            self.thread.start()
 
     def stop(self):  # idempotent and safe to call whenever
-        pass
+        if self.thread is not None:
+            self.queue.put(None)  # sentinel, everything queued before it still gets written
+            self.thread.join()
+
+            self.thread = None
+            self.queue  = None
+
+    def thread_writer(self):
+        queue = self.queue
+
+        if self.cpu is not None:
+            try:
+                os.sched_setaffinity(0, {self.cpu})  # 0 = calling thread on Linux
+            except (AttributeError, OSError) as exc:
+                logger.warning(f'image writer: could not pin {self.output} to cpu {self.cpu}: {exc}')
+
+        while (item := queue.get()) is not None:
+            try:
+                self._write_file(*item)
+            except Exception as exc:
+                logger.error(exc)
+
+    def encode(self, image):
+        """Encode an image the way this writer would write it.
 
-    def write(self, image, frame_id: str | None = None):
+        Args:
+            image: numpy array image data
+
+        Returns:
+            The encoded file contents as a numpy uint8 buffer, can be passed to `write(encoded=)` of any writer with
+            the same `encode_key`.
+        """
+        # Convert RGB to BGR if needed
+        if not self.is_bgr and len(image.shape) == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+        success, buf = cv2.imencode(self.ext, image, self.params)
+
+        if not success:
+            raise RuntimeError(f'failed to encode image as {self.format}')
+
+        return buf
+
+    def write(self, image, frame_id: str | None = None, *, encoded=None):
         """Write an image to file.
         
         Args:
             image: numpy array image data
             frame_id: Optional frame identifier for logging
+            encoded: Optional result of `encode(image)` from a writer with the same `encode_key`, skips encoding
         """
         if image is None:
             raise RuntimeError('cannot write None image')
         
-        # Convert RGB to BGR if needed
-        if not self.is_bgr and len(image.shape) == 3:
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-        
         # Generate filename with formatting
         filename = self._generate_filename(frame_id)
         
-        # Ensure directory exists
-        Path(filename).parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write image based on format
-        success = False
-        if self.format == 'jpg':
-            success = cv2.imwrite(filename, image, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
-        elif self.format == 'png':
-            success = cv2.imwrite(filename, image, [cv2.IMWRITE_PNG_COMPRESSION, self.compression])
-        elif self.format == 'bmp':
-            success = cv2.imwrite(filename, image)
-        elif self.format == 'tiff':
-            success = cv2.imwrite(filename, image)
-        elif self.format == 'webp':
-            success = cv2.imwrite(filename, image, [cv2.IMWRITE_WEBP_QUALITY, self.quality])
+        if self.thread is not None:
+            self.queue.put((filename, image, encoded))  # blocks when full, back-pressure to the caller
         else:
-            success = cv2.imwrite(filename, image)
-        
-        if not success:
-            raise RuntimeError(f'failed to write image to {filename}')
-        
+            self._write_file(filename, image, encoded)
+
         self.frame_count += 1
         logger.debug(f'wrote image: {filename} ({frame_id or "unknown"})')
 
+    def _write_file(self, filename: str, image, encoded=None):
+        # Ensure directory exists
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        
+        buf = self.encode(image) if encoded is None else encoded
+
+        try:
+            buf.tofile(filename)
+        except OSError as exc:
+            raise RuntimeError(f'failed to write image to {filename}') from exc
+
     def _generate_filename(self, frame_id: str | None = None):
         """Generate filename with timestamp and frame number formatting."""
-        filename = strftime(self.output)
+        if (t := int(time())) != self.strftime_t:  # format at most once per second, only changes at that resolution
+            self.strftime_t = t
+            self.strftime_s = strftime(self.output, localtime(t))
+
+        filename = self.strftime_s
         
         # Replace %d with frame count if present
         if '%d' in filename:
@@ -148,7 +214,7 @@ class ImageWriter:
 from openfilter.filter_runtime.filter import FilterConfig, Filter
 from openfilter.filter_runtime.utils import adict, split_commas_maybe
 
-__all__ = __all__ + ['ImageOutConfig', 'ImageOut']
+__all__ = __all__ + ['ImageOutConfig', 'ImageOutSink', 'ImageOut']
 
 
 class ImageOutConfig(FilterConfig):
@@ -158,6 +224,8 @@ class ImageOutConfig(FilterConfig):
             format: str | None
             quality: int | None
             compression: int | None
+            prefetch: int | None
+            pin_cpu: bool | None
 
         output: str
         topic: str | None
@@ -170,6 +238,31 @@ class ImageOutConfig(FilterConfig):
     format: str | None
     quality: int | None
     compression: int | None
+    prefetch: int | None
+    pin_cpu: bool | None
+
+
+@dataclass(frozen=True)
+class ImageOutSink:
+    """Structured form of one ImageOut output for use from Python, `ImageOutSink('/out/frame_%d.jpg', 'jpg',
+    quality=85)` is the same as 'file:///out/frame_%d.jpg!format=jpg!quality=85' but is not parsed from a string.
+    Options left as None fall back to the global ImageOut config."""
+
+    path: str  # with or without 'file://'
+    format: str | None = None
+    quality: int | None = None
+    compression: int | None = None
+    bgr: bool | None = None
+    prefetch: int | None = None
+    pin_cpu: bool | None = None
+    topic: str | None = None
+
+    def to_output(self) -> ImageOutConfig.Output:
+        options = {k: v for k in ('format', 'quality', 'compression', 'bgr', 'prefetch', 'pin_cpu')
+                   if (v := getattr(self, k)) is not None}
+
+        return ImageOutConfig.Output(output=self.path if is_file(self.path) else f'file://{self.path}',
+            topic=self.topic, options=ImageOutConfig.Output.Options(options))
 
 
 class ImageOut(Filter):
@@ -195,6 +288,11 @@ class ImageOut(Filter):
                   'options'?: {'format': 'png', 'quality': 95}},
                  {'output': 'file:///other/path', 'topic'?: 'camera2'}]
 
+                    is the same as
+
+                [ImageOutSink('/path/to/images_%Y%m%d_%H%M%S_%d.png', 'png', quality=95),
+                 ImageOutSink('/other/path', topic='camera2')]
+
             `outputs` individual options (text appended after output, e.g. 'file:///myimage.png!no-bgr!quality=80'):
                 '!bgr', '!no-bgr':
                     Set `bgr` option for this output.
@@ -208,6 +306,12 @@ class ImageOut(Filter):
                 '!compression=6':
                     Set `compression` option for this output (PNG only, 0-9).
 
+                '!prefetch=4':
+                    Set `prefetch` option for this output.
+
+                '!pin_cpu', '!no-pin_cpu':
+                    Set `pin_cpu` option for this output.
+
         bgr:
             True means images are in BGR format, False means RGB. Set here to apply to all outputs or
             can be set individually per output. Global env var default FILTER_BGR / IMAGE_OUT_BGR.
@@ -224,6 +328,21 @@ class ImageOut(Filter):
             PNG compression level (0-9). Only used for PNG format. Set here to apply to all outputs or
             can be set individually per output. Global env var default FILTER_COMPRESSION / IMAGE_OUT_COMPRESSION.
 
+        prefetch:
+            If > 0 then each output encodes and writes on its own background thread, fed by a queue of this many
+            images. `process()` only blocks when that queue is full, so outputs in different formats run in parallel
+            instead of one after another. Default 0 (write inline). Set here to apply to all outputs or can be set
+            individually per output.
+
+        pin_cpu:
+            If True then the background thread of each prefetching output is pinned to its own CPU, assigned round
+            robin over the CPUs this process may run on, so writer threads do not migrate between cores and compete
+            with each other. Only has an effect with `prefetch` > 0 and on platforms with thread affinity (Linux).
+            Default False. Set here to apply to all outputs or can be set individually per output.
+
+    Outputs with the same format, quality / compression and bgr settings which are written inline (no prefetch) share
+    a single encode of each image, e.g. a local and a mounted-bucket copy of the same PNG stream only pay for one encode.
+
     Environment variables (FILTER_* or legacy IMAGE_OUT_* prefix, legacy takes precedence):
         FILTER_BGR          / IMAGE_OUT_BGR
         FILTER_QUALITY      / IMAGE_OUT_QUALITY
@@ -235,6 +354,10 @@ class ImageOut(Filter):
     @classmethod
     def normalize_config(cls, config):
         outputs = split_commas_maybe(config.get('outputs'))  # we do not assume how Filter will normalize sources/outputs in the future
+
+        if isinstance(outputs, ImageOutSink):
+            outputs = [outputs]
+
         config  = ImageOutConfig(super().normalize_config(dict_without(config, 'outputs')))
 
         if outputs is not None:
@@ -246,7 +369,10 @@ class ImageOut(Filter):
             raise ValueError('must specify at least one output')
 
         for idx, output in enumerate(outputs):
-            if isinstance(output, dict):
+            if isinstance(output, ImageOutSink):
+                outputs[idx] = output.to_output()  # already structured, nothing to parse
+
+            elif isinstance(output, dict):
                 if not isinstance(output, ImageOutConfig.Output):
                     outputs[idx] = ImageOutConfig.Output(output)  # because silly user might have passed in dicts
 
@@ -265,7 +391,7 @@ class ImageOut(Filter):
                 output.options = options = ImageOutConfig.Output.Options() if options is None else ImageOutConfig.Output.Options(options)
 
             for option, value in list(options.items()):
-                if option not in ('bgr', 'format', 'quality', 'compression'):
+                if option not in ('bgr', 'format', 'quality', 'compression', 'prefetch', 'pin_cpu'):
                     once(logger.warning, f'unknown image output option: {option}', t=60*60)
                     del options[option]
 
@@ -281,8 +407,12 @@ class ImageOut(Filter):
         self.tops_n_writers = [(top, ImageWriter(out, **opts)) for top, out, opts in self.tops_n_outs_n_opts]
 
     def setup(self, config):
-        default_options = {'bgr': config.bgr, 'format': config.format, 'quality': config.quality, 'compression': config.compression}
+        default_options = {'bgr': config.bgr, 'format': config.format, 'quality': config.quality, 'compression': config.compression,
+            'prefetch': config.prefetch}
+        default_pin_cpu = config.pin_cpu
         self.tops_n_outs_n_opts = tops_n_outs_n_opts = []
+        cpus    = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else []
+        n_pins  = 0
 
         for output in config.outputs:
             topic   = output.get('topic') or 'main'
@@ -290,6 +420,10 @@ class ImageOut(Filter):
             options = adict({**default_options, **(options or {})})
             output  = output.output
 
+            if options.pop('pin_cpu', default_pin_cpu) and options.prefetch and cpus:
+                options.cpu = cpus[n_pins % len(cpus)]  # round robin, one writer thread per core until they run out
+                n_pins     += 1
+
             tops_n_outs_n_opts.append((topic, output, options))
 
         self.create_writers()
@@ -303,6 +437,8 @@ class ImageOut(Filter):
                 writer.stop()
 
     def process(self, frames):
+        encoded = {}  # {(frame_topic, encode_key): buf}, outputs with the same format and options encode each image once
+
         for topic, writer in self.tops_n_writers:
             # Support wildcard topic filtering for ImageOut
             matching_frames = {}
@@ -336,7 +472,14 @@ class ImageOut(Filter):
                 else:
                     frame_id = f"{frame_topic}_{frame_id}"
                 
-                writer.write(image, frame_id)
+                if writer.thread is not None:  # background writers encode on their own thread
+                    writer.write(image, frame_id)
+                else:
+                    if (buf := encoded.get(key := (frame_topic, writer.encode_key))) is None:  # not id(image), a converted
+                        # image is freed after this iteration and the next frame's conversion can reuse its id()
+                        buf = encoded[key] = writer.encode(image)
+
+                    writer.write(image, frame_id, encoded=buf)
             
             # Warning if no frames matched (only for non-wildcard topics)
             if '*' not in topic and not matching_frames:
@@ -0,0 +1,137 @@
+"""Minimal Linux inotify wrapper via ctypes, no third party dependency.
+
+Used by file:// sources which want to react to new files as soon as they are written instead of rescanning the
+directory every poll interval. On platforms without inotify (or with a libc that does not export it) `available()` is
+False and callers should fall back to polling. Note that inotify only sees changes made through the local kernel, so
+network mounts (NFS, CIFS) modified from other machines still need polling.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+
+__all__ = [
+    'IN_CLOSE_WRITE', 'IN_MOVED_FROM', 'IN_MOVED_TO', 'IN_CREATE', 'IN_DELETE', 'IN_DELETE_SELF', 'IN_MOVE_SELF',
+    'IN_Q_OVERFLOW', 'IN_IGNORED', 'IN_ONLYDIR', 'available', 'Inotify',
+]
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF   = 0x00000800
+IN_Q_OVERFLOW  = 0x00004000
+IN_IGNORED     = 0x00008000
+IN_ONLYDIR     = 0x01000000
+
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC  = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+_EVENT      = struct.Struct('iIII')  # wd, mask, cookie, len, followed by len bytes of NUL padded name
+_READ_SIZE  = 64 * 1024
+
+_libc = None
+
+
+def _get_libc():
+    global _libc
+
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes     = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes  = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+
+    return _libc
+
+
+def available() -> bool:
+    """Whether inotify can be used on this platform."""
+    if not sys.platform.startswith('linux'):
+        return False
+
+    try:
+        libc = _get_libc()
+        return hasattr(libc, 'inotify_init1') and hasattr(libc, 'inotify_add_watch')
+    except OSError:
+        return False
+
+
+class Inotify:
+    """An inotify instance. Add watches on paths then `read()` the events on them. Also usable as a context manager
+    which closes it on exit.
+
+    Events are returned as (wd, mask, name) tuples where `name` is the name of the file within a watched directory
+    which the event is about, or '' for events on the watched path itself (and for IN_Q_OVERFLOW, which has wd -1).
+    """
+
+    def __init__(self):
+        self.libc = _get_libc()
+
+        if (fd := self.libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)) < 0:
+            raise OSError(err := ctypes.get_errno(), f'inotify_init1: {os.strerror(err)}')
+
+        self.fd = fd
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def close(self):  # idempotent and safe to call whenever
+        if (fd := getattr(self, 'fd', None)) is not None:
+            self.fd = None
+
+            os.close(fd)
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch `path` for the events in `mask`, returns the watch descriptor events for it will carry."""
+        if (wd := self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)) < 0:
+            raise OSError(err := ctypes.get_errno(), f'inotify_add_watch {path!r}: {os.strerror(err)}')
+
+        return wd
+
+    def rm_watch(self, wd: int):
+        if self.libc.inotify_rm_watch(self.fd, wd) < 0:
+            raise OSError(err := ctypes.get_errno(), f'inotify_rm_watch: {os.strerror(err)}')
+
+    def read(self, timeout: float | None = None) -> list[tuple[int, int, str]]:
+        """Wait up to `timeout` seconds (forever if None) for events and return all that are available, an empty list
+        on timeout."""
+        if not select.select((self.fd,), (), (), timeout)[0]:
+            return []
+
+        try:
+            buf = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        size   = _EVENT.size
+
+        while offset < len(buf):
+            wd, mask, _, length = _EVENT.unpack_from(buf, offset)
+            offset += size
+            name    = os.fsdecode(buf[offset : offset + length].rstrip(b'\0'))
+            offset += length
+
+            events.append((wd, mask, name))
+
+        return events
@@ -73,6 +73,7 @@ import logging
 import os
 import re
 from json import dumps as json_dumps, loads as json_loads
+from threading import Lock
 from time import time_ns, sleep
 from typing import Callable, NamedTuple
 
@@ -127,7 +128,7 @@ TOPIC_DELIM_B         = b'/'
 TOPIC_DELIM2          = TOPIC_DELIM * 2
 TOPIC_DELIM_B2        = TOPIC_DELIM_B * 2
 
-is_zeromq_addr        = lambda addr: addr.startswith('tcp://') or addr.startswith('ipc://')
+is_zeromq_addr        = lambda addr: addr.startswith('tcp://') or addr.startswith('ipc://') or addr.startswith('inproc://')
 
 ZMQMessage            = list[JSONType | bytes]  # only the first OBLIGATORY element is arbitrary JSONType, rest (if present) MUST be bytes
 ZMQState              = tuple                   # for passing info between a Receiver and Sender
@@ -144,19 +145,22 @@ class ZMQStateRecv(NamedTuple):  # for ZMQReceiver.recv() from ZMQSender.send()
 
 class ZMQContext:
     context = (None, 0)
+    lock    = Lock()  # filters run by Filter.run_multi_inproc() get and free from their own threads
 
     @staticmethod
     def get():
-        ZMQContext.context = (ZMQContext.context[0], c + 1) if (c := ZMQContext.context[1]) else (zmq.Context(), 1)
+        with ZMQContext.lock:
+            ZMQContext.context = (ZMQContext.context[0], c + 1) if (c := ZMQContext.context[1]) else (zmq.Context(), 1)
 
-        return ZMQContext.context[0]
+            return ZMQContext.context[0]
 
     @staticmethod
     def free():
-        ZMQContext.context = (ZMQContext.context[0], (c := ZMQContext.context[1] - 1))
+        with ZMQContext.lock:
+            ZMQContext.context = (ZMQContext.context[0], (c := ZMQContext.context[1] - 1))
 
-        if not c:
-            ZMQContext.context[0].destroy()  # linger=0)
+            if not c:
+                ZMQContext.context[0].destroy()  # linger=0)
 
 
 class ZMQSender:
@@ -179,7 +183,8 @@ class ZMQSender:
 
         Args:
             addrs_bind: Single or list of strings of bind addresses to listen on, forms can take:
-                "tcp://*", "tcp:127.0.0.1:5552", "ipc://./pipe_in_cwd", "ipc:///abs_path/subdir/pipe"
+                "tcp://*", "tcp:127.0.0.1:5552", "ipc://./pipe_in_cwd", "ipc:///abs_path/subdir/pipe", "inproc://name"
+                ('inproc://' only reaches receivers in the same process, i.e. filters run by Filter.run_multi_inproc()).
 
             server_id: String ID for this server, if None then will be random string each time.
 
@@ -217,7 +222,7 @@ class ZMQSender:
                 pull_addr  = f'{host}:{port + 1}'
                 pub_addr   = f'{host}:{port}'
 
-            elif addr_bind.startswith('ipc://'):
+            elif addr_bind.startswith(('ipc://', 'inproc://')):  # inproc only reaches receivers in this process
                 pull_addr = f'{addr_bind}{IPC_REQREP_SUFFIX}'
                 pub_addr  = f'{addr_bind}{IPC_PUBSUB_SUFFIX}'
 
@@ -574,7 +579,7 @@ class ZMQReceiver:
                 push_addr  = f'{host}:{port + 1}'
                 sub_addr   = f'{host}:{port}'
 
-            elif addr_connect.startswith('ipc://'):
+            elif addr_connect.startswith(('ipc://', 'inproc://')):
                 push_addr = f'{addr_connect}{IPC_REQREP_SUFFIX}'
                 sub_addr  = f'{addr_connect}{IPC_PUBSUB_SUFFIX}'
 
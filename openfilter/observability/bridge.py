@@ -78,6 +78,11 @@ class OTelLineageExporter(MetricExporter):
                                 facet[name] = int(point.value)
                                 logger.info(f"[OpenLineage Export] Added counter: {name} = {int(point.value)}")
                                 
+                            # Handle base-2 exponential Histogram metrics, flattened to the explicit-bounds layout
+                            elif hasattr(point, 'scale') and hasattr(point, 'positive'):
+                                facet[f"{name}_histogram"] = self._exp_histogram_facet(point)
+                                logger.info(f"[OpenLineage Export] Added exponential histogram: {name}_histogram = {facet[f'{name}_histogram']}")
+
                             # Handle Histogram metrics
                             elif hasattr(point, 'bucket_counts') and hasattr(point, 'explicit_bounds'):
                                 # Fix: bucket_counts has one more element than explicit_bounds
@@ -127,6 +132,31 @@ class OTelLineageExporter(MetricExporter):
             logger.error(f"\033[91mFailed to export metrics to OpenLineage: {e}\033[0m")
             return MetricExportResult.FAILURE
 
+    @staticmethod
+    def _exp_histogram_facet(point) -> dict:
+        """Convert an exponential histogram data point to the same facet layout as explicit histograms.
+
+        Positive bucket i covers (base**(offset+i), base**(offset+i+1)] with base = 2**(2**-scale). Zero and negative
+        values are folded into the first count (everything <= the lowest bound) so `counts` is len(`buckets`) + 1.
+
+        Args:
+            point: ExponentialHistogramDataPoint
+
+        Returns:
+            Dict with 'buckets', 'counts', 'count' and 'sum'
+        """
+        base = 2.0 ** (2.0 ** -point.scale)
+        offset = point.positive.offset
+        positive_counts = [int(count) for count in point.positive.bucket_counts]
+        below = int(point.zero_count) + sum(int(count) for count in point.negative.bucket_counts)
+
+        return {
+            "buckets": [float(base ** (offset + i)) for i in range(len(positive_counts) + 1)] if positive_counts else [],
+            "counts": [below, *positive_counts, 0] if positive_counts else [below],
+            "count": int(point.count),
+            "sum": float(point.sum),
+        }
+
     def _is_allowed(self, metric_name: str) -> bool:
         """Check if a metric name is allowed by the allowlist.
         
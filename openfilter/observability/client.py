@@ -8,7 +8,7 @@ and export to various backends including OpenLineage.
 from collections import defaultdict
 import threading
 import time
-from typing import Optional, Any
+from typing import Iterable, Optional, Any
 from datetime import datetime, timezone
 import os
 import logging
@@ -21,8 +21,9 @@ from opentelemetry.sdk.resources import (
     SERVICE_INSTANCE_ID, 
 )
 from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.view import ExponentialBucketHistogramAggregation, View
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.metrics import Observation, set_meter_provider, get_meter
+from opentelemetry.metrics import Observation, set_meter_provider
 
 from .bridge import OTelLineageExporter
 from ._otlp import infer_otlp_insecure
@@ -103,7 +104,8 @@ class OpenTelemetryClient:
         exporter_config: Optional[dict] = None,
         enabled: bool = None,
         project_id: str | None = os.getenv("PROJECT_ID", None),
-        lineage_emitter: Optional[Any] = None
+        lineage_emitter: Optional[Any] = None,
+        exp_histogram_names: Optional[Iterable[str]] = None,
     ):
         """Initialize the OpenTelemetry client.
         
@@ -118,6 +120,7 @@ class OpenTelemetryClient:
             enabled: Whether telemetry is enabled
             project_id: Cloud project ID
             lineage_emitter: OpenLineage emitter for bridge export
+            exp_histogram_names: Names of histogram instruments to aggregate with base-2 exponential buckets
         """
         enabled_env = os.getenv("TELEMETRY_EXPORTER_ENABLED")
         if enabled is not None:
@@ -184,17 +187,25 @@ class OpenTelemetryClient:
                     except Exception as e:
                         logging.error(f"\033[91mFailed to initialize OpenLineage bridge: {e}\033[0m")
 
+                # Views must be known when the provider is built, instruments are created later by the registry
+                views = [
+                    View(instrument_name=name, aggregation=ExponentialBucketHistogramAggregation())
+                    for name in exp_histogram_names or ()
+                ]
+
                 # Create single provider with all metric readers
                 self.provider = MeterProvider(
-                    resource=resource, metric_readers=metric_readers
+                    resource=resource, metric_readers=metric_readers, views=views
                 )
                 set_meter_provider(self.provider)
-                self.meter = get_meter(service_name)
+                # From this client's own provider, not the global one, which is set once per process (all the filters
+                # of run_multi_inproc() share it) and would not have this client's views and readers
+                self.meter = self.provider.get_meter(service_name)
                 
                 # Create business meter using the same provider but with different scope
                 if lineage_emitter and 'lineage_exporter' in locals():
                     try:
-                        self.business_meter = get_meter(f"{service_name}_business")
+                        self.business_meter = self.provider.get_meter(f"{service_name}_business")
                         logging.info("Business metrics meter created - metrics will only go to OpenLineage")
                     except Exception as e:
                         logging.error(f"Failed to create business metrics meter: {e}")
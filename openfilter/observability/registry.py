@@ -7,8 +7,8 @@ of metrics based on MetricSpec declarations.
 
 import logging
 import math
-from typing import List
-from opentelemetry.metrics import Meter
+from typing import Callable, List, Optional, Sequence, Union
+from opentelemetry.metrics import CallbackOptions, Meter, Observation
 
 from .specs import MetricSpec
 
@@ -63,6 +63,10 @@ class TelemetryRegistry:
         """
         self._specs = specs
         self._meter = meter
+
+        # Counter totals accumulate here with a plain add per frame and are read by the SDK once per collection
+        # through an observable counter callback, instead of a locked counter.add() call on every frame
+        self._counter_totals: dict[str, Union[int, float]] = {}
         
         # Log business metrics being registered
         if specs:
@@ -73,7 +77,10 @@ class TelemetryRegistry:
         for spec in specs:
             try:
                 if spec.instrument == "counter":
-                    spec._otel_inst = meter.create_counter(spec.name)
+                    self._counter_totals[spec.name] = 0
+                    spec._otel_inst = meter.create_observable_counter(
+                        spec.name, callbacks=[self._observe_counter(spec.name)]
+                    )
                     logger.info(f"\033[92m[Business Metrics] Created counter: {spec.name}\033[0m")
                 elif spec.instrument == "histogram":
                     # Use provided boundaries or auto-generate
@@ -95,6 +102,10 @@ class TelemetryRegistry:
                     spec._otel_inst = meter.create_histogram(
                         spec.name, explicit_bucket_boundaries_advisory=boundaries
                     )
+                elif spec.instrument == "exp_histogram":
+                    # Aggregation is selected by the exponential View the OpenTelemetryClient registers for this name
+                    spec._otel_inst = meter.create_histogram(spec.name)
+                    logger.info(f"\033[92m[Business Metrics] Created exponential histogram: {spec.name}\033[0m")
                 elif spec.instrument == "gauge":
                     spec._otel_inst = meter.create_observable_gauge(spec.name)
                     logger.info(f"\033[92m[Business Metrics] Created gauge: {spec.name}\033[0m")
@@ -103,31 +114,103 @@ class TelemetryRegistry:
             except Exception as e:
                 logger.error(f"Failed to create instrument for metric '{spec.name}': {e}")
 
+        # Counters whose value_fn is a plain literal (e.g. frames_processed) are added once per batch as
+        # constant * number of frames, they never go through the per-frame evaluator.
+        self._constant_counters = [
+            (spec.name, spec._constant) for spec in specs
+            if spec._otel_inst is not None and spec.instrument == "counter" and spec._constant is not None
+        ]
+
+        for name, const in self._constant_counters:
+            if const < 0:
+                logger.warning(f"Counter '{name}' has negative constant value {const}, it will never be recorded")
+
+        self._constant_counters = [(name, const) for name, const in self._constant_counters if const >= 0]
+
+        # Precompile the per-frame path: only specs with a live instrument, each paired
+        # with its bound recording method so record() does no instrument-type dispatch.
+        constant = {name for name, _ in self._constant_counters}
+        active = [spec for spec in specs if spec._otel_inst is not None and spec.name not in constant]
+        self._active_specs = active
+        self._recorders = [self._recorder_for(spec) for spec in active]
+        self._evaluate = MetricSpec.compile_batch(active)
+
+    def _observe_counter(self, name: str) -> Callable[[CallbackOptions], List[Observation]]:
+        """Return the observable counter callback reporting the cumulative total of counter `name`."""
+        totals = self._counter_totals
+
+        def callback(options: CallbackOptions) -> List[Observation]:
+            return [Observation(totals[name])]
+
+        return callback
+
+    def _recorder_for(self, spec: MetricSpec) -> Optional[Callable[[Union[int, float]], None]]:
+        """Return the function used to record a value for `spec`, or None for gauges."""
+        if spec.instrument == "counter":
+            totals = self._counter_totals
+            name = spec.name
+
+            def add(val: Union[int, float]) -> None:
+                if val < 0:  # counters only go up, dropped like the SDK's Counter.add does
+                    logger.warning(f"Dropping negative value {val} for counter '{name}'")
+                    return
+                totals[name] += val
+
+            return add
+        if spec.instrument in ("histogram", "exp_histogram"):
+            return spec._otel_inst.record
+        return None  # gauges are observable, nothing to push per frame
+
     def record(self, frame_data: dict):
         """Record metrics for a frame based on registered specifications.
         
         Args:
             frame_data: Dictionary containing frame data to extract metrics from
         """
-        for spec in self._specs:
+        self.record_batch((frame_data,))
+
+    def record_batch(self, frames_data: Sequence[dict]):
+        """Record metrics for all the frames of one process() call.
+
+        Args:
+            frames_data: Frame data dictionaries to extract metrics from
+        """
+        if not frames_data:
+            return
+
+        totals = self._counter_totals
+        n = len(frames_data)
+
+        for name, const in self._constant_counters:
+            totals[name] += const * n
+
+        if self._active_specs:
+            for frame_data in frames_data:
+                self._record_frame(frame_data)
+
+    def _record_frame(self, frame_data: dict):
+        """Evaluate and record the non-constant specs for one frame."""
+        try:
+            values = self._evaluate(frame_data)
+        except Exception:
+            self._record_slow(frame_data)  # isolate the failing value_fn per spec
+            return
+
+        for (name, val), recorder in zip(values, self._recorders):
+            if val is None or recorder is None:
+                continue
+            try:
+                recorder(val)
+            except Exception as e:
+                logger.error(f"Failed to record metric '{name}': {e}")
+
+    def _record_slow(self, frame_data: dict):
+        """Evaluate and record each spec independently so one bad value_fn does not drop the rest."""
+        for spec, recorder in zip(self._active_specs, self._recorders):
             try:
-                if spec._otel_inst is None:
-                    continue
-                    
                 val = spec.value_fn(frame_data)
-                if val is None:
+                if val is None or recorder is None:
                     continue
-                    
-                if spec.instrument == "counter":
-                    spec._otel_inst.add(val)
-                    logger.debug(f"[Business Metrics] Recorded counter: {spec.name} = {val}")
-                elif spec.instrument == "histogram":
-                    spec._otel_inst.record(val)
-                    logger.debug(f"[Business Metrics] Recorded histogram: {spec.name} = {val}")
-                elif spec.instrument == "gauge":
-                    # Gauges are recorded differently - they need to be observable
-                    # For now, we'll use the current value as a simple approach
-                    logger.debug(f"[Business Metrics] Recorded gauge: {spec.name} = {val}")
-                    
+                recorder(val)
             except Exception as e:
-                logger.error(f"Failed to record metric '{spec.name}': {e}") 
\ No newline at end of file
+                logger.error(f"Failed to record metric '{spec.name}': {e}")
@@ -5,10 +5,82 @@ This module provides the MetricSpec dataclass for defining metrics
 in a declarative way.
 """
 
-from dataclasses import dataclass
-from typing import Callable, List, Optional, Union
+import dis
+from dataclasses import dataclass, field as dataclass_field
+from statistics import fmean
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 from opentelemetry.metrics import Instrument
 
+# Bytecode of a function which can do nothing but return a literal, e.g. `lambda d: 1`
+_CONSTANT_OPS = frozenset(('RESUME', 'NOP', 'CACHE', 'LOAD_CONST', 'RETURN_VALUE', 'RETURN_CONST'))
+
+
+def _constant_value(fn: Callable) -> Union[int, float, None]:
+    """Return the number `fn` always returns if its body is just a numeric literal, else None.
+
+    Decided from the bytecode rather than by probing calls, so `lambda d: 1 if d.get("x") else 1` style functions that
+    merely look constant for some inputs are never misdetected.
+    """
+    code = getattr(fn, '__code__', None)
+    if code is None or not all(ins.opname in _CONSTANT_OPS for ins in dis.get_instructions(code)):
+        return None
+    try:
+        val = fn({})
+    except Exception:
+        return None
+    return val if isinstance(val, (int, float)) else None
+
+
+def _as_number(val: Union[int, float, None]) -> Union[int, float, None]:
+    return val if isinstance(val, (int, float)) else None
+
+
+# Reductions of the (key extracted, predicate filtered) values for declarative specs, as source templates so that
+# compile_batch() can inline them into its generated evaluator. Empty input gives None (not recorded) for the
+# reductions that have no natural value for it. `{0}` must be a plain name, it may be evaluated more than once.
+_AGG_SOURCES = {
+    'value': '_as_number({0})',
+    'bool': '(1 if {0} else 0)',
+    'len': '(len({0}) if {0} else 0)',
+    'bool_count': '(sum(1 for x in {0} if x) if {0} else 0)',
+    'sum': '(sum({0}) if {0} else 0)',
+    'mean': '(fmean({0}) if {0} else None)',
+    'max': '(max({0}) if {0} else None)',
+    'min': '(min({0}) if {0} else None)',
+}
+
+_AGG_GLOBALS = {'_as_number': _as_number, 'fmean': fmean}
+
+_AGGS = {agg: eval(f'lambda v: {src.format("v")}', _AGG_GLOBALS) for agg, src in _AGG_SOURCES.items()}
+
+
+def _compile_declarative(
+    field: str, agg: str, key: Optional[str], predicate: Optional[Callable[[object], bool]]
+) -> Callable[[dict], Union[int, float, None]]:
+    """Build the value_fn for a `field` / `agg` / `key` / `predicate` spec."""
+    reduce = _AGGS[agg]
+
+    if key is None and predicate is None:
+        return lambda d: reduce(d.get(field))
+
+    def value_fn(d: dict) -> Union[int, float, None]:
+        vals = d.get(field)
+
+        if vals is None:
+            vals = ()
+        elif key is not None:
+            if isinstance(vals, dict):  # column-wise data, {key: [values, ...], ...}
+                vals = vals.get(key) or ()
+            else:  # one dict per item, [{key: value, ...}, ...]
+                vals = [v for item in vals if (v := item.get(key)) is not None]
+
+        if predicate is not None:
+            vals = [v for v in vals if predicate(v)]
+
+        return reduce(vals)
+
+    return value_fn
+
 
 @dataclass
 class MetricSpec:
@@ -16,23 +88,38 @@ class MetricSpec:
     
     Attributes:
         name: Name of the metric
-        instrument: Type of instrument ('counter', 'histogram', 'gauge')
-        value_fn: Function to extract value from frame data
-        boundaries: For histograms, bucket boundaries (optional - will auto-generate if None)
+        instrument: Type of instrument ('counter', 'histogram', 'exp_histogram', 'gauge'). 'exp_histogram' uses
+            OpenTelemetry's base-2 exponential bucket aggregation, so no boundaries need to be chosen
+        value_fn: Function to extract value from frame data, for custom logic. Exactly one of `value_fn` or `field`
+            must be given
+        field: Declarative alternative to `value_fn`, the frame data key the value comes from
+        agg: With `field`, how the value is reduced to a number: 'value' (as is), 'bool' (1 if truthy else 0), 'len',
+            'bool_count' (number of truthy items), 'sum', 'mean', 'max' or 'min'. Default 'value'
+        key: With `field`, the item key to take values from, for a list of dicts (`[{key: v}, ...]`) or column-wise
+            dict of sequences (`{key: [v, ...]}`)
+        predicate: With `field`, only values for which this returns True are aggregated
+        boundaries: For histograms, bucket boundaries (optional - will auto-generate if None, ignored for exp_histogram)
         num_buckets: For histograms, number of buckets to auto-generate (default: 10)
         _otel_inst: OpenTelemetry instrument instance (set by TelemetryRegistry)
+        _constant: The value value_fn always returns if it is a plain numeric literal like `lambda d: 1`, else None.
+            Counters with a constant are added once per batch of frames instead of evaluated per frame
     """
     name: str
-    instrument: str  # 'counter', 'histogram', 'gauge'
-    value_fn: Callable[[dict], Union[int, float, None]]
+    instrument: str  # 'counter', 'histogram', 'exp_histogram', 'gauge'
+    value_fn: Optional[Callable[[dict], Union[int, float, None]]] = None
     boundaries: Optional[List[Union[int, float]]] = None
     num_buckets: int = 10  # For auto-generated histogram buckets
     _otel_inst: Optional[Instrument] = None
+    field: Optional[str] = None
+    agg: Optional[str] = None
+    key: Optional[str] = None
+    predicate: Optional[Callable[[object], bool]] = None
+    _constant: Union[int, float, None] = dataclass_field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Validate the metric specification."""
-        if self.instrument not in ['counter', 'histogram', 'gauge']:
-            raise ValueError(f"Invalid instrument type: {self.instrument}. Must be 'counter', 'histogram', or 'gauge'")
+        if self.instrument not in ['counter', 'histogram', 'exp_histogram', 'gauge']:
+            raise ValueError(f"Invalid instrument type: {self.instrument}. Must be 'counter', 'histogram', 'exp_histogram', or 'gauge'")
         
         if self.instrument == 'histogram' and self.boundaries is not None:
             if len(self.boundaries) < 2:
@@ -41,4 +128,101 @@ class MetricSpec:
                 raise ValueError("Histogram boundaries must be in ascending order")
         
         if self.num_buckets < 2:
-            raise ValueError(f"Number of buckets must be at least 2, got {self.num_buckets}") 
\ No newline at end of file
+            raise ValueError(f"Number of buckets must be at least 2, got {self.num_buckets}")
+
+        if self.field is None:
+            if self.value_fn is None:
+                raise ValueError(f"Metric '{self.name}' needs either value_fn or field")
+            if self.agg is not None or self.key is not None or self.predicate is not None:
+                raise ValueError(f"Metric '{self.name}': agg, key and predicate can only be used with field")
+
+        else:
+            if self.value_fn is not None:
+                raise ValueError(f"Metric '{self.name}': value_fn and field are mutually exclusive")
+            if self.agg is None:
+                self.agg = 'value'
+            elif self.agg not in _AGGS:
+                raise ValueError(f"Invalid agg: {self.agg}. Must be one of {', '.join(repr(a) for a in _AGGS)}")
+
+            self.value_fn = _compile_declarative(self.field, self.agg, self.key, self.predicate)
+
+        self._constant = _constant_value(self.value_fn)
+
+    @classmethod
+    def compile_batch(
+        cls, specs: Sequence["MetricSpec"]
+    ) -> Callable[[dict], List[Tuple[str, Union[int, float, None]]]]:
+        """Build a single per-frame evaluator for a list of specs.
+
+        Python source for one function covering all the specs is generated and compiled once. Declarative specs are
+        fused: each `field` is looked up once, a list of dicts is walked once to pull out every `key` any spec on that
+        field needs and the aggregations are inlined. Literal `value_fn`s become constants, other `value_fn`s are called
+        from the generated function as is.
+
+        Args:
+            specs: MetricSpec instances to evaluate, in order
+
+        Returns:
+            Function taking frame data and returning a list of (name, value) pairs in
+            the same order as `specs`. Exceptions from a value_fn propagate to the caller.
+        """
+        namespace = dict(_AGG_GLOBALS)
+        fields = {}  # field -> (field var, {key: key var})
+        body = []    # extraction of fields and keys
+        aggs = []    # per spec aggregation statements
+        values = []  # per spec value expression
+
+        for idx, spec in enumerate(specs):
+            if spec.field is None:
+                if spec._constant is not None:
+                    namespace[f'_c{idx}'] = spec._constant
+                    values.append(f'_c{idx}')
+                else:
+                    namespace[f'_f{idx}'] = spec.value_fn
+                    values.append(f'_f{idx}(d)')
+
+                continue
+
+            if (fvar_keys := fields.get(spec.field)) is None:
+                fvar_keys = fields[spec.field] = (f'v{len(fields)}', {})
+
+            fvar, keys = fvar_keys
+
+            if spec.key is not None:
+                src = keys.setdefault(spec.key, f'{fvar}_k{len(keys)}')
+            elif spec.predicate is not None:
+                src = f'(() if {fvar} is None else {fvar})'
+            else:
+                src = fvar
+
+            if spec.predicate is not None:
+                namespace[f'_p{idx}'] = spec.predicate
+                aggs.append(f'    s{idx} = [x for x in {src} if _p{idx}(x)]')
+                src = f's{idx}'
+
+            values.append(_AGG_SOURCES[spec.agg].format(src))
+
+        for field, (fvar, keys) in fields.items():
+            body.append(f'    {fvar} = d.get({field!r})')
+
+            if not keys:
+                continue
+
+            body.append(f'    if {fvar} is None:')
+            body.extend(f'        {kvar} = ()' for kvar in keys.values())
+            body.append(f'    elif isinstance({fvar}, dict):  # column-wise data, {{key: [values, ...], ...}}')
+            body.extend(f'        {kvar} = {fvar}.get({key!r}) or ()' for key, kvar in keys.items())
+            body.append(f'    else:  # one dict per item, [{{key: value, ...}}, ...]')
+            body.extend(f'        {kvar} = []' for kvar in keys.values())
+            body.append(f'        for item in {fvar}:')
+
+            for key, kvar in keys.items():
+                body.append(f'            if (x := item.get({key!r})) is not None:')
+                body.append(f'                {kvar}.append(x)')
+
+        pairs = ', '.join(f'({spec.name!r}, {value})' for spec, value in zip(specs, values))
+        source = '\n'.join(['def evaluate(d):', *body, *aggs, f'    return [{pairs}]'])
+
+        exec(compile(source, '<MetricSpec.compile_batch>', 'exec'), namespace)
+
+        return namespace['evaluate']
@@ -5,6 +5,7 @@ import gc
 import logging
 import multiprocessing as mp
 import os
+import threading
 import unittest
 from multiprocessing import Queue
 from multiprocessing.queues import Empty
@@ -17,6 +18,7 @@ import numpy as np
 from openfilter.filter_runtime import Filter, FilterConfig, Frame, FilterContext
 from openfilter.filter_runtime.test import RunnerContext, FiltersToQueue, QueueToFilters
 from openfilter.filter_runtime.utils import setLogLevelGlobal
+from openfilter.filter_runtime.zeromq import ZMQContext
 from openfilter.filter_runtime.filters.util import Util
 from helpers import assert_empty
 
@@ -607,6 +609,74 @@ class TestFilter(unittest.TestCase):
             self.assertEqual(runner.wait(), [0, 0])
 
 
+    def test_run_multi_inproc(self):
+        stop_evt = threading.Event()
+        queue    = Queue()
+        result   = []
+        thread   = threading.Thread(target=lambda: result.extend(Filter.run_multi_inproc([
+            (SendCountOrNone, dict(
+                outputs = 'inproc://test-filter',
+            )),
+            (FiltersToQueue, dict(
+                sources = 'inproc://test-filter',
+                queue   = queue,
+            )),
+        ], stop_evt=stop_evt, sig_stop=False)), daemon=True)
+
+        thread.start()
+
+        try:
+            self.assertTrue(_strip_meta(queue.get(timeout=5)['main'].data) == {'count': 0})
+            self.assertTrue(_strip_meta(queue.get(timeout=5)['main'].data) == {'count': 2})
+
+        finally:
+            thread.join(5)
+            stop_evt.set()
+
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(stop_evt.is_set())
+        self.assertEqual(result, [0, 0])
+
+        # several pipelines at once, all filters get and free the shared ZeroMQ context from their own threads
+
+        refcount = ZMQContext.context[1]
+        stop_evt = threading.Event()
+        qins     = [Queue() for _ in range(4)]
+        qouts    = [Queue() for _ in range(4)]
+        result   = []
+        thread   = threading.Thread(target=lambda: result.extend(Filter.run_multi_inproc([
+            filter
+            for idx, (qin, qout) in enumerate(zip(qins, qouts))
+            for filter in (
+                (QueueToFilters, dict(
+                    outputs = f'inproc://test-Q2F-{idx}',
+                    queue   = qin,
+                )),
+                (FiltersToQueue, dict(
+                    sources = f'inproc://test-Q2F-{idx}',
+                    queue   = qout,
+                )),
+            )
+        ], stop_evt=stop_evt, sig_stop=False)), daemon=True)
+
+        thread.start()
+
+        try:
+            for idx, qin in enumerate(qins):
+                qin.put({'main': Frame({'idx': idx})})
+
+            for idx, qout in enumerate(qouts):
+                self.assertEqual(_strip_meta(qout.get(timeout=5)['main'].data), {'idx': idx})
+
+        finally:
+            stop_evt.set()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result, [0] * 8)
+        self.assertEqual(ZMQContext.context[1], refcount)
+
+
     def test_process_return_none_callback(self):
         with RunnerContext([
             (SendCountOrNoneCB, dict(
@@ -6,15 +6,18 @@ import queue
 import shutil
 import tempfile
 import unittest
+from time import sleep
+from unittest.mock import patch
 
 import cv2
 import numpy as np
 
+from openfilter.filter_runtime import inotify
 from openfilter.filter_runtime.filter import Filter
 from openfilter.filter_runtime.filters.image_in import ImageIn
 from openfilter.filter_runtime.test import FiltersToQueue
 from openfilter.filter_runtime.utils import setLogLevelGlobal
-from openfilter.filter_runtime.filters.image_in import ImageInConfig
+from openfilter.filter_runtime.filters.image_in import ImageInConfig, compile_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -137,6 +140,17 @@ class TestImageIn(unittest.TestCase):
         self.assertEqual(ncfg1, dcfg)
         self.assertEqual(ncfg1, ncfg2)
 
+    def test_compile_pattern(self):
+        """Test that compiled patterns follow the glob (file name), regex (path) and literal rules."""
+        self.assertTrue(compile_pattern('*.jpg')('/images/a.jpg'))
+        self.assertFalse(compile_pattern('*.jpg')('/images.jpg/a.png'))
+        self.assertTrue(compile_pattern('img_?.jpg')('/images/img_1.jpg'))
+        self.assertTrue(compile_pattern(r'\.png$')('/images/a.png'))  # no '*' or '?', so a regex
+        self.assertFalse(compile_pattern(r'\.png$')('/images/a.jpg'))
+        self.assertTrue(compile_pattern('b[')('/images/b[1].jpg'))  # invalid regex, literal match
+        self.assertTrue(compile_pattern(None)('/images/a.bmp'))
+        self.assertIs(compile_pattern('*.jpg'), compile_pattern('*.jpg'))
+
     def test_basic_read(self):
         """Test basic image reading functionality."""
         runner = Filter.Runner([
@@ -385,6 +399,243 @@ class TestImageIn(unittest.TestCase):
             runner.stop()
             queue.close()
 
+    @unittest.skipUnless(inotify.available(), 'inotify not available')
+    def test_watch_inotify(self):
+        """Test that watch='inotify' picks up a new image right away instead of at the next poll."""
+        watch_dir = os.path.join(self.test_dir, "watched")
+        os.makedirs(watch_dir, exist_ok=True)
+
+        runner = Filter.Runner([
+            (ImageIn, dict(
+                sources=f'file://{watch_dir}',
+                outputs='ipc://test-ImageIn',
+                poll_interval=300,  # would never see the new image in time if polling
+                watch='inotify',
+            )),
+            (FiltersToQueue, dict(
+                sources='ipc://test-ImageIn',
+                queue=(queue := FiltersToQueue.Queue()).child_queue,
+            )),
+        ], exit_time=10)
+
+        try:
+            sleep(1)  # let the filter start and its watch get set up
+            path = create_test_images(watch_dir, 1)[0]
+
+            frame = queue.get(timeout=5)['main']
+
+            self.assertEqual(frame.data['meta']['src'], path)
+
+        finally:
+            runner.stop()
+            queue.close()
+
+    @unittest.skipUnless(inotify.available(), 'inotify not available')
+    def test_watch_inotify_pattern_and_delete(self):
+        """Test that watched events are filtered by pattern and a deleted then rewritten image is sent again."""
+        watch_dir = os.path.join(self.test_dir, "watched_pattern")
+        os.makedirs(watch_dir, exist_ok=True)
+
+        runner = Filter.Runner([
+            (ImageIn, dict(
+                sources=f'file://{watch_dir}!pattern=*.jpg',
+                outputs='ipc://test-ImageIn',
+                poll_interval=300,
+                watch='inotify',
+            )),
+            (FiltersToQueue, dict(
+                sources='ipc://test-ImageIn',
+                queue=(queue := FiltersToQueue.Queue()).child_queue,
+            )),
+        ], exit_time=10)
+
+        try:
+            sleep(1)
+            cv2.imwrite(os.path.join(watch_dir, 'excluded.png'), create_test_image())
+            path = create_test_images(watch_dir, 1)[0]
+
+            self.assertEqual(queue.get(timeout=5)['main'].data['meta']['src'], path)
+
+            os.unlink(path)
+            sleep(0.5)
+            create_test_images(watch_dir, 1)
+
+            self.assertEqual(queue.get(timeout=5)['main'].data['meta']['src'], path)
+
+            with self.assertRaises(Exception):  # the png never shows up
+                queue.get(timeout=1)
+
+        finally:
+            runner.stop()
+            queue.close()
+
+    @unittest.skipUnless(inotify.available(), 'inotify not available')
+    def test_watch_inotify_moved_out(self):
+        """Test that an image moved out of a watched directory is dropped from the queue like a deleted one."""
+        watch_dir = os.path.join(self.test_dir, "watched_moved")
+        away_dir  = os.path.join(self.test_dir, "moved_away")
+        os.makedirs(watch_dir, exist_ok=True)
+        os.makedirs(away_dir, exist_ok=True)
+
+        config = ImageIn.normalize_config(dict(sources=f'file://{watch_dir}', outputs='tcp://*', poll_interval=300,
+            watch='inotify'))
+        filter_instance = ImageIn(config)
+        filter_instance.setup(config)
+        filter_instance.shutdown()  # no watch thread, events are read and applied by hand below
+        queue = filter_instance.queues['main']
+
+        watcher, watched = filter_instance._start_watcher()
+
+        try:
+            def handle_events():
+                filter_instance._handle_watch_events(watcher.read(1), watched)
+
+            path, other = create_test_images(watch_dir, 2)
+            handle_events()
+            self.assertEqual(sorted(queue), [path, other])
+
+            os.rename(path, os.path.join(away_dir, os.path.basename(path)))
+            handle_events()
+            self.assertEqual(queue, [other])
+
+            filter_instance.processed['main'].add(queue.pop(0))
+            os.rename(other, os.path.join(away_dir, os.path.basename(other)))
+            handle_events()
+            self.assertNotIn(other, filter_instance.processed['main'])  # moved back in later counts as a new image
+
+        finally:
+            watcher.close()
+
+    def test_scan_seen_cache(self):
+        """Test that polling queues a new image once, and re-queues images which change or are deleted and re-added."""
+        scan_dir = os.path.join(self.test_dir, "scanned")
+        os.makedirs(scan_dir, exist_ok=True)
+        path = create_test_images(scan_dir, 1)[0]
+
+        config = ImageIn.normalize_config(dict(sources=f'file://{scan_dir}', outputs='tcp://*', poll_interval=300))
+        filter_instance = ImageIn(config)
+        filter_instance.setup(config)
+        filter_instance.shutdown()  # no poll thread, scans are done by hand below
+        queue = filter_instance.queues['main']
+
+        def scan():
+            filter_instance._scan_sources(config.sources)
+
+        self.assertEqual(queue, [path])  # listed by setup()
+        scan()
+        scan()  # unchanged and still queued, not queued twice
+        self.assertEqual(queue, [path])
+
+        filter_instance.processed['main'].add(queue.pop(0))
+        scan()  # unchanged and already sent
+        self.assertEqual(queue, [])
+
+        cv2.imwrite(path, create_test_image(width=64))  # rewritten, different size
+        scan()
+        self.assertEqual(queue, [path])
+
+        filter_instance.processed['main'].add(queue.pop(0))
+        os.unlink(path)
+        scan()
+        self.assertNotIn(path, filter_instance.processed['main'])
+
+        create_test_images(scan_dir, 1)  # same name back
+        scan()
+        self.assertEqual(queue, [path])
+
+    def test_scan_queue_order(self):
+        """Test that images found by a scan are queued in name order whatever order the directory lists them in."""
+        order_dir = os.path.join(self.test_dir, "scan_order")
+        os.makedirs(order_dir, exist_ok=True)
+
+        config = ImageIn.normalize_config(dict(sources=f'file://{order_dir}', outputs='tcp://*', poll_interval=300))
+        filter_instance = ImageIn(config)
+        filter_instance.setup(config)
+        filter_instance.shutdown()  # no poll thread, scans are done by hand below
+
+        paths = [os.path.join(order_dir, f'{name}.jpg') for name in ('c', 'a', 'e', 'b', 'd')]
+
+        for path in paths:
+            cv2.imwrite(path, create_test_image())
+
+        filter_instance._scan_sources(config.sources)
+        self.assertEqual(filter_instance.queues['main'], sorted(paths))
+
+        cv2.imwrite(path := os.path.join(order_dir, '0.jpg'), create_test_image())  # new ones go after what's queued
+        filter_instance._scan_sources(config.sources)
+        self.assertEqual(filter_instance.queues['main'], sorted(paths) + [path])
+
+    def test_decode_cache(self):
+        """Test that unchanged local images are decoded once and changed or deleted ones are not served from cache."""
+        cache_dir = os.path.join(self.test_dir, "cached")
+        os.makedirs(cache_dir, exist_ok=True)
+        path, other = create_test_images(cache_dir, 2)
+
+        # 0.4 MB is room for two 320x200 images but not a third 64x200 one too
+        config = ImageIn.normalize_config(dict(sources=f'file://{cache_dir}', outputs='tcp://*', poll_interval=300,
+            decode_cache=0.4))
+        filter_instance = ImageIn(config)
+        filter_instance.setup(config)
+        filter_instance.shutdown()
+
+        image = filter_instance._load_image(path)
+        self.assertFalse(image.flags.writeable)
+        self.assertIs(filter_instance._load_image(path), image)
+
+        cv2.imwrite(path, create_test_image(width=64))  # rewritten, different size
+        self.assertEqual(filter_instance._load_image(path).shape[1], 64)
+
+        filter_instance._load_image(other)
+        filter_instance._load_image(self.test_images[0])  # evicts the least recently used
+        self.assertNotIn(path, filter_instance._decode_cache)
+        self.assertEqual(filter_instance._decode_cache_bytes,
+            sum(image.nbytes for _, image in filter_instance._decode_cache.values()))
+
+        os.unlink(other)
+        self.assertIsNone(filter_instance._load_image(other))
+        self.assertNotIn(other, filter_instance._decode_cache)
+
+    def test_poll_backoff(self):
+        """Test that the poll interval doubles up to poll_interval_max while scans find nothing and resets on a change."""
+        config = ImageIn.normalize_config(dict(sources=f'file://{self.test_dir}', outputs='tcp://*', watch='poll',
+            poll_interval=1, poll_interval_max=8))
+        changes = iter([True, False, False, False, False, False, True, False])
+        waits = []
+
+        class StopEvent:
+            def is_set(self):
+                return len(waits) == 8
+
+            def wait(self, timeout):
+                waits.append(timeout)
+
+        filter_instance = ImageIn(config)
+
+        with patch.object(ImageIn, '_poll_loop'):  # not started by setup(), run by hand below
+            filter_instance.setup(config)
+
+        filter_instance.stop_event = StopEvent()
+        filter_instance._scan_sources = lambda sources: next(changes)
+        filter_instance._poll_loop()
+
+        self.assertEqual(waits, [1, 2, 4, 8, 8, 8, 1, 2])
+
+        # without poll_interval_max there is no backoff
+        config.poll_interval_max = None
+        changes = iter([False] * 8)
+        waits.clear()
+        filter_instance._poll_loop()
+
+        self.assertEqual(waits, [1] * 8)
+
+    def test_watch_config(self):
+        """Test watch option validation."""
+        config = ImageIn.normalize_config(dict(sources='file:///tmp', outputs='tcp://*', watch='INOTIFY'))
+        self.assertEqual(config.watch, 'inotify')
+
+        with self.assertRaises(ValueError):
+            ImageIn.normalize_config(dict(sources='file:///tmp', outputs='tcp://*', watch='fanotify'))
+
     def test_excluded_images_scenario(self):
         """Test scenario 2: Directory with excluded images that get matching images added."""
         # Create directory with excluded images only
@@ -6,13 +6,14 @@ import os
 import shutil
 import tempfile
 import unittest
+from unittest.mock import patch
 from pathlib import Path
 
 import cv2
 import numpy as np
 
 from openfilter.filter_runtime.filter import Filter
-from openfilter.filter_runtime.filters.image_out import ImageOut, ImageOutConfig, ImageWriter
+from openfilter.filter_runtime.filters.image_out import ImageOut, ImageOutConfig, ImageOutSink, ImageWriter
 from openfilter.filter_runtime.test import QueueToFilters
 from openfilter.filter_runtime.utils import setLogLevelGlobal
 from openfilter.filter_runtime.frame import Frame
@@ -219,6 +220,31 @@ class TestImageWriter(unittest.TestCase):
         self.assertTrue(os.path.exists(nested_path))
         self.assertTrue(os.path.exists(os.path.dirname(nested_path)))
 
+    def test_image_writer_prefetch(self):
+        """Test that a prefetching writer writes everything on its own thread by the time stop() returns."""
+        output_path = os.path.join(self.test_dir, "test.png")
+        writer = ImageWriter(f"file://{output_path}", prefetch=2)
+        writer.start()
+
+        try:
+            self.assertIsNotNone(writer.thread)
+
+            for i in range(5):
+                writer.write(GREEN_IMAGE, str(i))
+
+        finally:
+            writer.stop()
+
+        self.assertIsNone(writer.thread)
+        self.assertEqual(writer.frame_count, 5)
+
+        for i in range(5):
+            written_img = cv2.imread(os.path.join(self.test_dir, f"test_{i}.png"))
+            self.assertIsNotNone(written_img)
+            self.assertTrue(is_image_color(written_img, (0, 255, 0)))
+
+        writer.stop()  # idempotent
+
 
 class TestImageOutConfig(unittest.TestCase):
     """Test the ImageOutConfig class."""
@@ -237,6 +263,54 @@ class TestImageOutConfig(unittest.TestCase):
         self.assertEqual(normalized.outputs[0].output, 'file:///tmp/test.jpg')
         self.assertEqual(normalized.outputs[0].topic, 'main')
     
+    def test_pin_cpu_round_robin(self):
+        """Test that pin_cpu assigns CPUs round robin to prefetching writers only."""
+        config = ImageOut.normalize_config({
+            'sources': 'tcp://localhost:5550',
+            'outputs': ['file:///tmp/a_%d.png', 'file:///tmp/b_%d.png',
+                        'file:///tmp/c_%d.png!prefetch=0', 'file:///tmp/d_%d.png!no-pin_cpu'],
+            'prefetch': 2,
+            'pin_cpu': True,
+        })
+
+        filter_instance = ImageOut(config)
+
+        with patch('openfilter.filter_runtime.filters.image_out.os.sched_getaffinity', create=True, return_value={3, 5}), \
+                patch('openfilter.filter_runtime.filters.image_out.os.sched_setaffinity', create=True) as setaffinity:
+            filter_instance.setup(config)
+            filter_instance.shutdown()
+
+        self.assertEqual([w.cpu for _, w in filter_instance.tops_n_writers], [3, 5, None, None])
+        self.assertEqual(sorted(c.args[1] for c in setaffinity.call_args_list), [{3}, {5}])
+
+    def test_normalize_config_sinks(self):
+        """Test that ImageOutSink outputs normalize to the same config as the equivalent strings."""
+        config = ImageOut.normalize_config({
+            'sources': 'tcp://localhost:5550',
+            'outputs': [ImageOutSink('/tmp/test_%d.jpg', 'jpg', quality=85),
+                        ImageOutSink('file:///tmp/other.png', compression=1, prefetch=2, topic='camera2')],
+        })
+        expected = ImageOut.normalize_config({
+            'sources': 'tcp://localhost:5550',
+            'outputs': ['file:///tmp/test_%d.jpg!format=jpg!quality=85',
+                        'file:///tmp/other.png!compression=1!prefetch=2;camera2'],
+        })
+
+        self.assertEqual(config.outputs, expected.outputs)
+
+        config = ImageOut.normalize_config({'sources': 'tcp://localhost:5550', 'outputs': ImageOutSink('/tmp/single.png')})
+
+        self.assertEqual(config.outputs, [{'output': 'file:///tmp/single.png', 'topic': 'main', 'options': {}}])
+
+    def test_normalize_config_prefetch_option(self):
+        """Test that prefetch is accepted as a per-output option."""
+        config = ImageOut.normalize_config({
+            'sources': 'tcp://localhost:5550',
+            'outputs': 'file:///tmp/test.jpg!prefetch=4'
+        })
+
+        self.assertEqual(config.outputs[0].options.prefetch, 4)
+
     def test_normalize_config_multiple_outputs(self):
         """Test config normalization with multiple outputs."""
         config = {
@@ -479,6 +553,61 @@ class TestImageOut(unittest.TestCase):
         finally:
             filter_instance.shutdown()
     
+    def test_image_out_shared_encoding(self):
+        """Test that outputs with identical format and options encode each image only once."""
+        output1_path = os.path.join(self.test_dir, "a", "test.png")
+        output2_path = os.path.join(self.test_dir, "b", "test.png")
+        output3_path = os.path.join(self.test_dir, "c", "test.png")
+
+        config = ImageOut.normalize_config({
+            'sources': 'tcp://localhost:5550',
+            'outputs': [f'file://{output1_path}', f'file://{output2_path}', f'file://{output3_path}!compression=1'],
+        })
+
+        filter_instance = ImageOut(config)
+        filter_instance.setup(config)
+
+        try:
+            with patch('openfilter.filter_runtime.filters.image_out.cv2.imencode', wraps=cv2.imencode) as imencode:
+                filter_instance.process({'main': create_test_frames()['main']})
+
+            self.assertEqual(imencode.call_count, 2)  # one for the two identical outputs, one for compression=1
+
+            for sub in ('a', 'b', 'c'):
+                written_img = cv2.imread(os.path.join(self.test_dir, sub, "test_main_1.png"))
+                self.assertIsNotNone(written_img)
+                self.assertTrue(is_image_color(written_img, (0, 0, 255)))
+
+        finally:
+            filter_instance.shutdown()
+
+    def test_image_out_shared_encoding_wildcard_rgb(self):
+        """Test that each frame of a wildcard output gets its own encoding when its BGR image is converted from RGB."""
+        config = ImageOut.normalize_config({
+            'sources': 'tcp://localhost:5550',
+            'outputs': [f'file://{os.path.join(self.test_dir, "a", "face.png")};face_*',
+                        f'file://{os.path.join(self.test_dir, "b", "face.png")};face_*'],
+        })
+
+        filter_instance = ImageOut(config)
+        filter_instance.setup(config)
+
+        colors = {'face_1': (0, 0, 255), 'face_2': (0, 255, 0), 'face_3': (255, 0, 0)}  # RGB
+
+        try:
+            # writable RGB frames, each output converts them to a new BGR array which is freed right after its write
+            filter_instance.process({topic: Frame(create_test_image(color=color), {'meta': {'id': 1}}, 'RGB')
+                for topic, color in colors.items()})
+
+            for sub in ('a', 'b'):
+                for topic, color in colors.items():
+                    written_img = cv2.imread(os.path.join(self.test_dir, sub, f"face_{topic}_1.png"))
+                    self.assertIsNotNone(written_img)
+                    self.assertTrue(is_image_color(written_img, color[::-1]))
+
+        finally:
+            filter_instance.shutdown()
+
     def test_image_out_frame_numbering(self):
         """Test ImageOut with frame number formatting."""
         output_path = os.path.join(self.test_dir, "frame_%d.jpg")
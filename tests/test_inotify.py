@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from openfilter.filter_runtime import inotify
+
+
+@unittest.skipUnless(inotify.available(), 'inotify not available')
+class TestInotify(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_events(self):
+        """Test that written, moved in and deleted files are reported by name and other changes are not."""
+        with inotify.Inotify() as watcher:
+            wd = watcher.add_watch(self.test_dir, inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_DELETE)
+
+            os.makedirs(os.path.join(self.test_dir, 'subdir'))  # IN_CREATE, not asked for
+
+            with open(tmp := os.path.join(self.test_dir, 'a.tmp'), 'wb') as f:
+                f.write(b'data')
+
+            os.rename(tmp, path := os.path.join(self.test_dir, 'a.jpg'))
+            os.unlink(path)
+
+            events = []
+            while new := watcher.read(1):
+                events.extend(new)
+
+        self.assertEqual(events, [
+            (wd, inotify.IN_CLOSE_WRITE, 'a.tmp'),
+            (wd, inotify.IN_MOVED_TO, 'a.jpg'),
+            (wd, inotify.IN_DELETE, 'a.jpg'),
+        ])
+
+    def test_timeout_and_close(self):
+        """Test that read() returns nothing on timeout and close() is idempotent."""
+        watcher = inotify.Inotify()
+        watcher.add_watch(self.test_dir, inotify.IN_CLOSE_WRITE)
+
+        self.assertEqual(watcher.read(0.05), [])
+
+        watcher.close()
+        watcher.close()
+
+        self.assertIsNone(watcher.fd)
+
+    def test_add_watch_missing_path(self):
+        """Test that watching a path which does not exist raises OSError."""
+        with inotify.Inotify() as watcher:
+            with self.assertRaises(OSError):
+                watcher.add_watch(os.path.join(self.test_dir, 'missing'), inotify.IN_CLOSE_WRITE)
+
+
+if __name__ == '__main__':
+    unittest.main()
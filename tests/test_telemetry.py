@@ -4,7 +4,11 @@ Tests for the telemetry system.
 
 import unittest
 from unittest.mock import Mock, patch
-from openfilter.observability import MetricSpec, TelemetryRegistry, read_allowlist
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import ExponentialHistogram, InMemoryMetricReader
+from opentelemetry.sdk.metrics.view import ExponentialBucketHistogramAggregation, View
+
+from openfilter.observability import MetricSpec, TelemetryRegistry, OTelLineageExporter, OpenTelemetryClient, read_allowlist
 
 
 class TestMetricSpec(unittest.TestCase):
@@ -35,6 +39,100 @@ class TestMetricSpec(unittest.TestCase):
         self.assertEqual(spec.instrument, "histogram")
         self.assertEqual(spec.boundaries, [0, 1, 2, 5])
 
+    def test_metric_spec_exp_histogram(self):
+        """Test that exp_histogram is a valid instrument and unknown instruments are rejected."""
+        spec = MetricSpec(name="test_exp", instrument="exp_histogram", value_fn=lambda d: 1.0)
+        self.assertEqual(spec.instrument, "exp_histogram")
+
+        with self.assertRaises(ValueError):
+            MetricSpec(name="test_bad", instrument="summary", value_fn=lambda d: 1.0)
+
+    def test_compile_batch(self):
+        """Test the compiled evaluator returns (name, value) pairs in spec order."""
+        specs = [
+            MetricSpec(name="a", instrument="counter", value_fn=lambda d: 1),
+            MetricSpec(name="b", instrument="histogram", value_fn=lambda d: len(d.get("items", []))),
+            MetricSpec(name="c", instrument="histogram", value_fn=lambda d: None),
+        ]
+        evaluate = MetricSpec.compile_batch(specs)
+
+        self.assertEqual(evaluate({"items": [1, 2]}), [("a", 1), ("b", 2), ("c", None)])
+        self.assertEqual(MetricSpec.compile_batch([])({}), [])
+
+    def test_compile_batch_declarative(self):
+        """Test the fused evaluator matches each spec's own value_fn and reads every item of a list once."""
+        class Item(dict):
+            gets = 0
+
+            def get(self, *args):
+                Item.gets += 1
+                return super().get(*args)
+
+        specs = [
+            MetricSpec(name="plates", instrument="counter", field="plates", agg="len"),
+            MetricSpec(name="max_conf", instrument="histogram", field="plates", key="confidence", agg="max"),
+            MetricSpec(name="mean_conf", instrument="histogram", field="plates", key="confidence", agg="mean"),
+            MetricSpec(name="confident", instrument="counter", field="plates", key="confidence", agg="bool_count",
+                predicate=lambda c: c > 0.6),
+            MetricSpec(name="regions", instrument="histogram", field="regions", key="confidences", agg="sum"),
+            MetricSpec(name="custom", instrument="histogram", value_fn=lambda d: len(d)),
+        ]
+        evaluate = MetricSpec.compile_batch(specs)
+
+        for data in ({}, {"plates": [], "regions": None},
+                     {"plates": [{"confidence": 0.5}, {"confidence": 0.9}, {}], "regions": {"confidences": [0.2, 0.4]}}):
+            self.assertEqual(evaluate(data), [(spec.name, spec.value_fn(data)) for spec in specs])
+
+        Item.gets = 0
+        evaluate({"plates": [Item(confidence=0.5), Item(confidence=0.9)]})
+        self.assertEqual(Item.gets, 2)
+
+    def test_constant_detection(self):
+        """Test that only value_fns which are plain numeric literals are detected as constant."""
+        def spec(fn):
+            return MetricSpec(name="c", instrument="counter", value_fn=fn)
+
+        self.assertEqual(spec(lambda d: 1)._constant, 1)
+        self.assertEqual(spec(lambda d: 2.5)._constant, 2.5)
+        self.assertIsNone(spec(lambda d: None)._constant)
+        self.assertIsNone(spec(lambda d: len(d))._constant)
+        self.assertIsNone(spec(lambda d: 1 if d.get("x") else 1)._constant)  # constant on every input, but not a literal
+        self.assertIsNone(spec(Mock(return_value=1))._constant)
+
+    def test_declarative_spec(self):
+        """Test field / agg / key / predicate specs against list-of-dicts and column-wise frame data."""
+        def value(d, **kwargs):
+            return MetricSpec(name="m", instrument="histogram", **kwargs).value_fn(d)
+
+        rows = {"plates": [{"confidence": 0.5}, {"confidence": 0.9}, {"text": "no confidence"}]}
+        cols = {"regions": {"confidences": [0.2, 0.4]}}
+
+        self.assertEqual(value(rows, field="plates", agg="len"), 3)
+        self.assertEqual(value(rows, field="plates", agg="bool"), 1)
+        self.assertEqual(value(rows, field="plates", key="confidence", agg="max"), 0.9)
+        self.assertEqual(value(rows, field="plates", key="confidence", agg="len"), 2)
+        self.assertEqual(value(rows, field="plates", key="confidence", agg="bool_count", predicate=lambda c: c > 0.6), 1)
+        self.assertAlmostEqual(value(cols, field="regions", key="confidences", agg="mean"), 0.3)
+        self.assertAlmostEqual(value(cols, field="regions", key="confidences", agg="sum"), 0.6)
+        self.assertEqual(value({"n": 7}, field="n"), 7)
+
+        # missing data
+        self.assertEqual(value({}, field="plates", agg="len"), 0)
+        self.assertEqual(value({}, field="plates", agg="bool"), 0)
+        self.assertIsNone(value({}, field="plates", key="confidence", agg="mean"))
+        self.assertIsNone(value({}, field="n"))
+
+    def test_declarative_spec_validation(self):
+        """Test that value_fn and field are mutually exclusive and one of them is required."""
+        with self.assertRaises(ValueError):
+            MetricSpec(name="m", instrument="counter")
+        with self.assertRaises(ValueError):
+            MetricSpec(name="m", instrument="counter", value_fn=lambda d: 1, field="x")
+        with self.assertRaises(ValueError):
+            MetricSpec(name="m", instrument="counter", value_fn=lambda d: 1, agg="len")
+        with self.assertRaises(ValueError):
+            MetricSpec(name="m", instrument="counter", field="x", agg="median")
+
 
 class TestTelemetryRegistry(unittest.TestCase):
     """Test TelemetryRegistry functionality."""
@@ -45,7 +143,7 @@ class TestTelemetryRegistry(unittest.TestCase):
         self.mock_counter = Mock()
         self.mock_histogram = Mock()
         
-        self.mock_meter.create_counter.return_value = self.mock_counter
+        self.mock_meter.create_observable_counter.return_value = self.mock_counter
         self.mock_meter.create_histogram.return_value = self.mock_histogram
         
         self.specs = [
@@ -61,13 +159,23 @@ class TestTelemetryRegistry(unittest.TestCase):
                 boundaries=[0, 1, 2, 5]
             )
         ]
+
+    def observe_counter(self, name):
+        """Run the observable counter callback the registry registered for `name` and return the observed value."""
+        for call in self.mock_meter.create_observable_counter.call_args_list:
+            if call.args[0] == name:
+                (observation,) = call.kwargs["callbacks"][0](None)
+                return observation.value
+
+        raise KeyError(name)
     
     def test_registry_creation(self):
         """Test creating a TelemetryRegistry."""
         registry = TelemetryRegistry(self.mock_meter, self.specs)
         
         # Verify instruments were created
-        self.mock_meter.create_counter.assert_called_once_with("test_counter")
+        self.mock_meter.create_observable_counter.assert_called_once()
+        self.assertEqual(self.mock_meter.create_observable_counter.call_args.args, ("test_counter",))
         self.mock_meter.create_histogram.assert_called_once_with(
             "test_histogram", explicit_bucket_boundaries_advisory=[0, 1, 2, 5]
         )
@@ -84,12 +192,32 @@ class TestTelemetryRegistry(unittest.TestCase):
         frame_data = {"items": ["a", "b", "c"]}
         registry.record(frame_data)
         
-        # Verify counter was called
-        self.mock_counter.add.assert_called_once_with(1)
+        # Verify counter accumulated without a per-frame SDK call
+        self.mock_counter.add.assert_not_called()
+        self.assertEqual(self.observe_counter("test_counter"), 1)
         
         # Verify histogram was called
         self.mock_histogram.record.assert_called_once_with(3)
+
+        registry.record(frame_data)
+        self.assertEqual(self.observe_counter("test_counter"), 2)
     
+    def test_registry_record_batch(self):
+        """Test that constant counters are added once per batch and the rest are evaluated per frame."""
+        value_fn = Mock(return_value=1)
+        specs = [
+            MetricSpec(name="frames", instrument="counter", value_fn=lambda d: 1),
+            MetricSpec(name="with_items", instrument="counter", value_fn=value_fn),
+        ]
+
+        registry = TelemetryRegistry(self.mock_meter, specs)
+        registry.record_batch([{}, {}, {}])
+        registry.record_batch([])
+
+        self.assertEqual(self.observe_counter("frames"), 3)
+        self.assertEqual(self.observe_counter("with_items"), 3)
+        self.assertEqual(value_fn.call_count, 3)
+
     def test_registry_recording_none_value(self):
         """Test recording when value_fn returns None."""
         specs = [
@@ -104,8 +232,144 @@ class TestTelemetryRegistry(unittest.TestCase):
         frame_data = {"test": "data"}
         registry.record(frame_data)
         
-        # Should not call the instrument
-        specs[0]._otel_inst.add.assert_not_called()
+        # Should not count anything
+        self.assertEqual(self.observe_counter("test_none"), 0)
+
+    def test_registry_recording_negative_counter_value(self):
+        """Test that negative counter values are dropped, counters only go up."""
+        specs = [
+            MetricSpec(
+                name="test_negative",
+                instrument="counter",
+                value_fn=lambda d: d["delta"]
+            )
+        ]
+
+        registry = TelemetryRegistry(self.mock_meter, specs)
+        registry.record_batch([{"delta": 3}, {"delta": -2}, {"delta": 1}])
+
+        self.assertEqual(self.observe_counter("test_negative"), 4)
+
+    def test_registry_recording_isolates_failing_value_fn(self):
+        """Test that one failing value_fn does not prevent other metrics from recording."""
+        specs = [
+            MetricSpec(
+                name="test_bad",
+                instrument="histogram",
+                value_fn=lambda d: d["missing"]
+            ),
+            MetricSpec(
+                name="test_counter",
+                instrument="counter",
+                value_fn=lambda d: 1
+            )
+        ]
+
+        registry = TelemetryRegistry(self.mock_meter, specs)
+        registry.record({})
+
+        self.mock_histogram.record.assert_not_called()
+        self.assertEqual(self.observe_counter("test_counter"), 1)
+
+    def test_registry_skips_failed_instruments(self):
+        """Test that specs whose instrument could not be created are never evaluated."""
+        self.mock_meter.create_histogram.side_effect = RuntimeError("boom")
+        value_fn = Mock(return_value=1)
+        specs = [
+            MetricSpec(
+                name="test_histogram",
+                instrument="histogram",
+                value_fn=value_fn,
+                boundaries=[0, 1, 2]
+            )
+        ]
+
+        registry = TelemetryRegistry(self.mock_meter, specs)
+        registry.record({})
+
+        value_fn.assert_not_called()
+
+    def test_registry_exp_histogram(self):
+        """Test that an exp_histogram is created without boundaries and recorded like a histogram."""
+        specs = [MetricSpec(name="test_exp", instrument="exp_histogram", value_fn=lambda d: 0.5)]
+
+        registry = TelemetryRegistry(self.mock_meter, specs)
+        registry.record({})
+
+        self.mock_meter.create_histogram.assert_called_once_with("test_exp")
+        self.mock_histogram.record.assert_called_once_with(0.5)
+
+
+class TestOTelLineageExporter(unittest.TestCase):
+    """Test OTelLineageExporter facet conversion."""
+
+    def test_counter_facet(self):
+        """Test that counters accumulated by the registry are exported as their running total."""
+        reader = InMemoryMetricReader()
+        provider = MeterProvider(metric_readers=[reader])
+        specs = [MetricSpec(name="test_count", instrument="counter", value_fn=lambda d: d["n"])]
+        registry = TelemetryRegistry(provider.get_meter("test"), specs)
+
+        for n in (1, 2, 3):
+            registry.record({"n": n})
+
+        lineage = Mock()
+        OTelLineageExporter(lineage).export(reader.get_metrics_data())
+        provider.shutdown()
+
+        self.assertEqual(lineage.update_heartbeat_lineage.call_args.kwargs["facets"]["test_count"], 6)
+
+    def test_exp_histogram_facet(self):
+        """Test that exponential histograms are exported with the explicit-bounds facet layout."""
+        reader = InMemoryMetricReader()
+        provider = MeterProvider(
+            metric_readers=[reader],
+            views=[View(instrument_name="test_exp", aggregation=ExponentialBucketHistogramAggregation())],
+        )
+        specs = [MetricSpec(name="test_exp", instrument="exp_histogram", value_fn=lambda d: d["v"])]
+        registry = TelemetryRegistry(provider.get_meter("test"), specs)
+
+        for v in (0, 0.6, 0.85, 0.92):
+            registry.record({"v": v})
+
+        lineage = Mock()
+        exporter = OTelLineageExporter(lineage)
+        exporter.export(reader.get_metrics_data())
+        provider.shutdown()
+
+        facet = lineage.update_heartbeat_lineage.call_args.kwargs["facets"]["test_exp_histogram"]
+
+        self.assertEqual(facet["count"], 4)
+        self.assertAlmostEqual(facet["sum"], 2.37)
+        self.assertEqual(len(facet["counts"]), len(facet["buckets"]) + 1)
+        self.assertEqual(sum(facet["counts"]), 4)
+        self.assertEqual(facet["counts"][0], 1)  # the zero
+        self.assertLessEqual(facet["buckets"][0], 0.6)
+        self.assertGreaterEqual(facet["buckets"][-1], 0.92)
+
+    def test_client_views_per_client(self):
+        """Test that each OpenTelemetryClient in a process applies its own exp_histogram views (as the filters run by
+        run_multi_inproc() do), not those of the first client to set the global meter provider."""
+        readers = []
+
+        def reader(**kwargs):
+            readers.append(InMemoryMetricReader())
+            return readers[-1]
+
+        with patch("openfilter.observability.client.PeriodicExportingMetricReader", side_effect=reader):
+            clients = [OpenTelemetryClient(service_name=f"svc{idx}", exporter_type="silent", enabled=True,
+                exp_histogram_names=[f"exp{idx}"]) for idx in range(2)]
+
+        for idx, client in enumerate(clients):
+            client.meter.create_histogram(f"exp{idx}").record(0.5)
+
+        for idx, (client, reader) in enumerate(zip(clients, readers)):
+            (metric,) = [metric for resource_metrics in reader.get_metrics_data().resource_metrics
+                for scope_metrics in resource_metrics.scope_metrics for metric in scope_metrics.metrics]
+            client.provider.shutdown()
+
+            self.assertEqual(metric.name, f"exp{idx}")
+            self.assertIsInstance(metric.data, ExponentialHistogram)
 
 
 class TestConfig(unittest.TestCase):